@@ -1,3 +1,8 @@
+import os
+import hashlib
+from abc import ABC, abstractmethod
+import warnings
+import joblib
 import pandas as pd
 import numpy as np
 from typing import Tuple, List, Dict, Any
@@ -7,13 +12,26 @@ from sklearn.metrics import (
     confusion_matrix, roc_curve, precision_recall_curve, 
     average_precision_score
 )
-from sklearn.model_selection import TimeSeriesSplit, GridSearchCV
+from sklearn.model_selection import TimeSeriesSplit, GridSearchCV, ParameterGrid, ParameterSampler
+from sklearn.base import BaseEstimator, TransformerMixin, clone
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.pipeline import Pipeline
+from joblib import Memory, Parallel, cpu_count, delayed, parallel_backend
 import xgboost as xgb
-import matplotlib.pyplot as plt
-import seaborn as sns
-import shap  # Add SHAP import
+
+# Headless runs (e.g. scheduled training jobs) render with the non-interactive Agg
+# backend so no GUI toolkit is loaded
+if os.environ.get('HEADLESS'):
+    import matplotlib
+    matplotlib.use('Agg')
+
+# numba is optional; without it the sklearn scalers are used
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 def split_data(X: pd.DataFrame, y: pd.Series, train_ratio: float = 0.6, val_ratio: float = 0.2) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, pd.Series]:
     """
@@ -30,29 +48,142 @@ def split_data(X: pd.DataFrame, y: pd.Series, train_ratio: float = 0.6, val_rati
             X_train, X_val, X_test, y_train, y_val, y_test
     """
     total_rows = len(X)
-    train_size = int(total_rows * train_ratio)
-    val_size = int(total_rows * val_ratio)
+    train_end = int(total_rows * train_ratio)
+    val_end = train_end + int(total_rows * val_ratio)
+    
+    # Slice the underlying arrays positionally and rebuild light pandas wrappers.
+    # Binary labels are stored as int8 to keep them compact next to float32 features.
+    X_values = X.to_numpy()
+    y_values = y.to_numpy()
+    if y_values.dtype.kind in 'biu':
+        y_values = y_values.astype(np.int8, copy=False)
+    index = X.index
     
     # Time-based split to avoid look-ahead bias
-    X_train = X.iloc[:train_size]
-    X_val = X.iloc[train_size:train_size + val_size]
-    X_test = X.iloc[train_size + val_size:]
+    X_train = pd.DataFrame(X_values[:train_end], columns=X.columns, index=index[:train_end], copy=False)
+    X_val = pd.DataFrame(X_values[train_end:val_end], columns=X.columns, index=index[train_end:val_end], copy=False)
+    X_test = pd.DataFrame(X_values[val_end:], columns=X.columns, index=index[val_end:], copy=False)
     
-    y_train = y.iloc[:train_size]
-    y_val = y.iloc[train_size:train_size + val_size]
-    y_test = y.iloc[train_size + val_size:]
+    y_train = pd.Series(y_values[:train_end], index=index[:train_end], name=y.name, copy=False)
+    y_val = pd.Series(y_values[train_end:val_end], index=index[train_end:val_end], name=y.name, copy=False)
+    y_test = pd.Series(y_values[val_end:], index=index[val_end:], name=y.name, copy=False)
     
     print(f"Training set: {X_train.shape[0]} samples from {X_train.index.min().date()} to {X_train.index.max().date()}")
     print(f"Validation set: {X_val.shape[0]} samples from {X_val.index.min().date()} to {X_val.index.max().date()}")
     print(f"Test set: {X_test.shape[0]} samples from {X_test.index.min().date()} to {X_test.index.max().date()}")
     
     # Check class distribution in each set
-    print(f"\nCrash events in training set: {y_train.sum()} ({y_train.mean():.2%})")
-    print(f"Crash events in validation set: {y_val.sum()} ({y_val.mean():.2%})")
-    print(f"Crash events in test set: {y_test.sum()} ({y_test.mean():.2%})")
+    y_train_values = y_values[:train_end]
+    y_val_values = y_values[train_end:val_end]
+    y_test_values = y_values[val_end:]
+    print(f"\nCrash events in training set: {int(np.count_nonzero(y_train_values))} ({y_train_values.mean():.2%})")
+    print(f"Crash events in validation set: {int(np.count_nonzero(y_val_values))} ({y_val_values.mean():.2%})")
+    print(f"Crash events in test set: {int(np.count_nonzero(y_test_values))} ({y_test_values.mean():.2%})")
     
     return X_train, X_val, X_test, y_train, y_val, y_test
 
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _robust_fit_kernel(X):
+        # Per-column median and interquartile range, one column per thread
+        n_features = X.shape[1]
+        center = np.empty(n_features)
+        scale = np.empty(n_features)
+        quantiles = np.array([25.0, 50.0, 75.0])
+        for j in prange(n_features):
+            q = np.nanpercentile(X[:, j], quantiles)
+            center[j] = q[1]
+            iqr = q[2] - q[0]
+            scale[j] = iqr if iqr != 0.0 else 1.0
+        return center, scale
+
+    @njit(parallel=True, cache=True)
+    def _standard_fit_kernel(X):
+        # Per-column mean and (population) standard deviation
+        n_features = X.shape[1]
+        center = np.empty(n_features)
+        scale = np.empty(n_features)
+        for j in prange(n_features):
+            center[j] = np.nanmean(X[:, j])
+            std = np.nanstd(X[:, j])
+            scale[j] = std if std != 0.0 else 1.0
+        return center, scale
+
+    @njit(parallel=True, cache=True)
+    def _minmax_fit_kernel(X):
+        # Per-column minimum and range, mapping each column onto [0, 1]
+        n_features = X.shape[1]
+        center = np.empty(n_features)
+        scale = np.empty(n_features)
+        for j in prange(n_features):
+            lo = np.nanmin(X[:, j])
+            span = np.nanmax(X[:, j]) - lo
+            center[j] = lo
+            scale[j] = span if span != 0.0 else 1.0
+        return center, scale
+
+    @njit(parallel=True, cache=True)
+    def _scale_kernel(X, center, scale):
+        # (X - center) / scale over a C-contiguous array, one row per iteration
+        out = np.empty_like(X)
+        for i in prange(X.shape[0]):
+            for j in range(X.shape[1]):
+                out[i, j] = (X[i, j] - center[j]) / scale[j]
+        return out
+
+class _NumbaAffineScaler(ABC, BaseEstimator, TransformerMixin):
+    """
+    Base class for Numba-compiled scalers of the form (X - center) / scale. Subclasses
+    provide the kernel that fits center and scale; columns are fitted in parallel and
+    the transform is a single compiled pass over the array.
+    """
+    @abstractmethod
+    def _fit_kernel(self, X):
+        """Return the per-column (center, scale) arrays for a C-contiguous float64 X."""
+
+    def fit(self, X, y=None):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        self.center_, self.scale_ = self._fit_kernel(X)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        X = np.ascontiguousarray(X)
+        if X.dtype not in (np.float32, np.float64):
+            X = X.astype(np.float64)
+        return _scale_kernel(X, self.center_, self.scale_)
+
+    def inverse_transform(self, X):
+        return np.asarray(X) * self.scale_ + self.center_
+
+class NumbaRobustScaler(_NumbaAffineScaler):
+    """
+    Numba-compiled equivalent of sklearn's RobustScaler with its default settings
+    (centering on the median, scaling by the 25-75 interquartile range).
+    """
+    def _fit_kernel(self, X):
+        return _robust_fit_kernel(X)
+
+class NumbaStandardScaler(_NumbaAffineScaler):
+    """Numba-compiled equivalent of sklearn's StandardScaler (zero mean, unit variance)."""
+    def _fit_kernel(self, X):
+        return _standard_fit_kernel(X)
+
+class NumbaMinMaxScaler(_NumbaAffineScaler):
+    """Numba-compiled equivalent of sklearn's MinMaxScaler with the default (0, 1) range."""
+    def _fit_kernel(self, X):
+        return _minmax_fit_kernel(X)
+
+def _make_scaler(scaler_type: str) -> object:
+    """Create an unfitted scaler for the given scaler type ('robust', 'standard', 'minmax')."""
+    if scaler_type == 'robust':
+        return NumbaRobustScaler() if HAS_NUMBA else RobustScaler()
+    elif scaler_type == 'standard':
+        return NumbaStandardScaler() if HAS_NUMBA else StandardScaler()
+    elif scaler_type == 'minmax':
+        return NumbaMinMaxScaler() if HAS_NUMBA else MinMaxScaler()
+    raise ValueError(f"Unknown scaler type: {scaler_type}. Choose from ['robust', 'standard', 'minmax']")
+
 def normalize_data(X_train: pd.DataFrame, X_val: pd.DataFrame, X_test: pd.DataFrame, scaler_type: str = 'robust') -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, object]:
     """
     Normalize the data using the specified scaler type. Fits the scaler on training data only
@@ -69,41 +200,46 @@ def normalize_data(X_train: pd.DataFrame, X_val: pd.DataFrame, X_test: pd.DataFr
         
     Returns:
         Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, object]: 
-            X_train_scaled, X_val_scaled, X_test_scaled, fitted_scaler
+            X_train_scaled, X_val_scaled, X_test_scaled (float32), fitted_scaler
     """
     print("\nNormalizing data...")
     
     # Select scaler based on type
+    scaler = _make_scaler(scaler_type)
     if scaler_type == 'robust':
-        scaler = RobustScaler()
         print("Using RobustScaler (median and IQR) - recommended for financial data with outliers")
     elif scaler_type == 'standard':
-        scaler = StandardScaler()
         print("Using StandardScaler (mean and std) - good for normally distributed data")
     elif scaler_type == 'minmax':
-        scaler = MinMaxScaler()
         print("Using MinMaxScaler (bounded range) - good when you need values in a specific range")
-    else:
-        raise ValueError(f"Unknown scaler type: {scaler_type}. Choose from ['robust', 'standard', 'minmax']")
+    
+    # Scale contiguous float32 arrays directly instead of round-tripping through
+    # DataFrames; column names and index are only reattached to the results
+    X_train_arr = np.ascontiguousarray(X_train.to_numpy(), dtype=np.float32)
+    X_val_arr = np.ascontiguousarray(X_val.to_numpy(), dtype=np.float32)
+    X_test_arr = np.ascontiguousarray(X_test.to_numpy(), dtype=np.float32)
     
     # Fit scaler on training data only
     X_train_scaled = pd.DataFrame(
-        scaler.fit_transform(X_train),
+        scaler.fit_transform(X_train_arr),
         columns=X_train.columns,
-        index=X_train.index
+        index=X_train.index,
+        copy=False
     )
     
     # Transform validation and test data using the fitted scaler
     X_val_scaled = pd.DataFrame(
-        scaler.transform(X_val),
+        scaler.transform(X_val_arr),
         columns=X_val.columns,
-        index=X_val.index
+        index=X_val.index,
+        copy=False
     )
     
     X_test_scaled = pd.DataFrame(
-        scaler.transform(X_test),
+        scaler.transform(X_test_arr),
         columns=X_test.columns,
-        index=X_test.index
+        index=X_test.index,
+        copy=False
     )
     
     print(f"Training set shape: {X_train_scaled.shape}")
@@ -112,6 +248,90 @@ def normalize_data(X_train: pd.DataFrame, X_val: pd.DataFrame, X_test: pd.DataFr
     
     return X_train_scaled, X_val_scaled, X_test_scaled, scaler
 
+def _negative_to_positive_ratio(y: pd.Series) -> float:
+    """Ratio of negative to positive labels, used as XGBoost's scale_pos_weight."""
+    positives = int(np.count_nonzero(y.to_numpy()))
+    return (len(y) - positives) / max(positives, 1)
+
+def _stack_train_val(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Stack the training and validation sets for cross-validated tuning. The features are
+    combined into a single C-contiguous float32 block so every CV fit reads the same
+    compact array.
+    """
+    index = X_train.index.append(X_val.index)
+    X_train_val = pd.DataFrame(
+        np.concatenate([X_train.to_numpy(dtype=np.float32), X_val.to_numpy(dtype=np.float32)]),
+        columns=X_train.columns,
+        index=index,
+        copy=False
+    )
+    y_train_val = pd.Series(
+        np.concatenate([y_train.to_numpy(), y_val.to_numpy()]),
+        index=index,
+        name=y_train.name,
+        copy=False
+    )
+    return X_train_val, y_train_val
+
+def _xgb_cuda_available() -> bool:
+    """Whether XGBoost was built with CUDA support and can actually train on a GPU."""
+    if not xgb.build_info().get('USE_CUDA'):
+        return False
+    # A CUDA build on a machine without a GPU silently falls back to the CPU with a
+    # warning, so probe with a one-round fit and look for that warning
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        try:
+            xgb.train(
+                {'device': 'cuda', 'tree_method': 'hist'},
+                xgb.DMatrix(np.zeros((2, 1)), label=[0, 1]),
+                num_boost_round=1
+            )
+        except xgb.core.XGBoostError:
+            return False
+    return not any('Device is changed' in str(w.message) for w in caught)
+
+class _EarlyStoppingXGBClassifier(xgb.XGBClassifier):
+    """
+    XGBClassifier that holds out the most recent part of its training data as an
+    early-stopping eval set. GridSearchCV cannot pass an eval_set to fit, so this lets
+    each CV fit pick its own number of trees instead of searching over n_estimators.
+    """
+    def __init__(self, *, eval_fraction: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.eval_fraction = eval_fraction
+
+    def get_xgb_params(self):
+        # eval_fraction is a sklearn-side parameter; the booster would warn it is unused
+        params = super().get_xgb_params()
+        params.pop('eval_fraction', None)
+        return params
+
+    def fit(self, X, y, sample_weight=None, **kwargs):
+        # Rows are time-ordered, so the tail is the most recent data
+        split = int(len(X) * (1 - self.eval_fraction))
+        X_fit, X_eval = (X.iloc[:split], X.iloc[split:]) if hasattr(X, 'iloc') else (X[:split], X[split:])
+        y_fit, y_eval = (y.iloc[:split], y.iloc[split:]) if hasattr(y, 'iloc') else (y[:split], y[split:])
+        if len(np.unique(y_eval)) < 2:
+            # Crash labels come in clusters, so the tail can hold a single class. AUC is
+            # undefined there and early stopping would keep only the first tree, so fit
+            # all the data with the full n_estimators instead.
+            early_stopping_rounds = self.early_stopping_rounds
+            self.early_stopping_rounds = None
+            try:
+                return super().fit(X, y, sample_weight=sample_weight, verbose=False, **kwargs)
+            finally:
+                self.early_stopping_rounds = early_stopping_rounds
+        if sample_weight is not None:
+            sample_weight = sample_weight[:split]
+        return super().fit(X_fit, y_fit, sample_weight=sample_weight, eval_set=[(X_eval, y_eval)], verbose=False, **kwargs)
+
 def tune_hyperparameters(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -121,7 +341,13 @@ def tune_hyperparameters(
     n_splits: int = 3,
     n_jobs: int = -1,
     show_cv_plot: bool = False,
-    param_grid: Dict[str, Any] = None
+    param_grid: Dict[str, Any] = None,
+    use_gpu: bool = False,
+    scaler_type: str = None,
+    cache_dir: str = ".sk_cache",
+    search_strategy: str = 'grid',
+    model_cache_dir: str = None,
+    train_val: Tuple[pd.DataFrame, pd.Series] = None
 ) -> Tuple[Any, float, Dict[str, Any]]:
     """
     Tune hyperparameters for the specified model type using time-series cross-validation
@@ -137,6 +363,23 @@ def tune_hyperparameters(
         n_jobs: Number of jobs to run in parallel. Defaults to -1 (use all processors).
         show_cv_plot: Whether to show cross-validation scores plot. Defaults to False.
         param_grid: Parameter grid for the model type
+        use_gpu: Whether to train XGBoost on a CUDA device. Falls back to CPU when
+            CUDA is not available. Ignored for other model types. Defaults to False.
+        scaler_type: If set ('robust', 'standard', 'minmax'), scale raw features inside a
+            Pipeline so each CV fold fits its own scaler. The fitted scaler of a fold is cached
+            under cache_dir and reused by every parameter combination evaluated on that fold.
+            The returned best model is then a Pipeline. Defaults to None (inputs already scaled).
+        cache_dir: Directory for the Pipeline transformer cache. Defaults to ".sk_cache".
+        search_strategy: 'grid' evaluates every combination in the grid. 'coord_descent'
+            evaluates a random sample of up to 10 combinations, then sweeps one hyperparameter
+            at a time from the best point found so far. This costs a number of fits linear in
+            the total number of grid values instead of their product. Defaults to 'grid'.
+        model_cache_dir: If set, the tuned (best_model, best_val_score, best_params) are saved
+            there with joblib, keyed by a hash of the data, parameter grid and search settings.
+            A later call with identical inputs loads the result instead of re-tuning.
+            Defaults to None (no caching).
+        train_val: Optional precomputed (X_train_val, y_train_val) from _stack_train_val,
+            so callers tuning several model types on the same data stack it only once.
         
     Returns:
         Tuple[Any, float, Dict[str, Any]]: 
@@ -144,12 +387,21 @@ def tune_hyperparameters(
     """
     print(f"\nTuning hyperparameters for {model_type} model...")
     
+    # GPU training only applies to XGBoost; fall back to CPU when CUDA is unavailable
+    if use_gpu and model_type == 'xgb':
+        if not _xgb_cuda_available():
+            print("CUDA not available to XGBoost, falling back to CPU training")
+            use_gpu = False
+    else:
+        use_gpu = False
+    
     # Combine train and validation sets for parameter tuning
-    X_train_val = pd.concat([X_train, X_val])
-    y_train_val = pd.concat([y_train, y_val])
+    if train_val is None:
+        train_val = _stack_train_val(X_train, y_train, X_val, y_val)
+    X_train_val, y_train_val = train_val
     
     # Calculate class weight for imbalanced data
-    class_weight = sum(y_train_val==0)/sum(y_train_val==1)
+    class_weight = _negative_to_positive_ratio(y_train_val)
     
     # Define parameter grids for each model type
     if param_grid is None:
@@ -172,18 +424,14 @@ def tune_hyperparameters(
                 'criterion': ['gini']  # Removed entropy since gini is usually sufficient
             },
             'gb': {
-                'n_estimators': [20, 50],  # Reduced to be proportional to feature count
+                'max_iter': [20, 50],  # Number of boosting iterations
                 'learning_rate': [0.1, 0.2],  # Reduced from 3 to 2 values
                 'max_depth': [3, 5],  # Reduced from 3 to 2 values
-                'min_samples_split': [2, 5],  # Reduced from 3 to 2 values
-                'min_samples_leaf': [1, 2],  # Reduced from 3 to 2 values
-                'subsample': [0.8, 1.0],
-                'loss': ['deviance'],  # Removed exponential
-                'max_features': ['sqrt'],  # Removed log2
-                'criterion': ['friedman_mse']  # Removed squared_error
+                'min_samples_leaf': [10, 20],  # Histogram trees need larger leaves
+                'l2_regularization': [0, 0.1],
+                'class_weight': ['balanced', None]
             },
             'xgb': {
-                'n_estimators': [20, 50],  # Reduced to be proportional to feature count
                 'max_depth': [3, 5],  # Reduced from 3 to 2 values
                 'learning_rate': [0.1, 0.2],  # Reduced from 3 to 2 values
                 'subsample': [0.8, 1.0],
@@ -197,51 +445,140 @@ def tune_hyperparameters(
         }
         param_grid = param_grids[model_type]
     
+    # Reuse a previously tuned model when the data and search settings are unchanged
+    cache_path = None
+    if model_cache_dir is not None:
+        hasher = hashlib.blake2b(digest_size=8)
+        hasher.update(np.ascontiguousarray(X_train_val.to_numpy()).tobytes())
+        hasher.update(np.ascontiguousarray(y_train_val.to_numpy()).tobytes())
+        hasher.update(repr((list(X_train_val.columns), sorted(param_grid.items()), n_splits, scaler_type, search_strategy, use_gpu)).encode())
+        cache_path = os.path.join(model_cache_dir, f"{model_type}_{hasher.hexdigest()}.joblib")
+        if os.path.exists(cache_path):
+            best_model, best_val_score, best_params = joblib.load(cache_path)
+            print(f"Loaded tuned {model_type} model from {cache_path}")
+            print(f"\nBest parameters: {best_params}")
+            print(f"Best cross-validation score: {best_val_score:.4f}")
+            return best_model, best_val_score, best_params
+    
     # Select model and parameter grid
     if model_type == 'logistic':
         model = LogisticRegression(random_state=42)
     elif model_type == 'rf':
-        model = RandomForestClassifier(random_state=42)
+        model = RandomForestClassifier(random_state=42, n_jobs=1)  # GridSearchCV owns the parallelism
     elif model_type == 'gb':
-        model = GradientBoostingClassifier(random_state=42)
+        model = HistGradientBoostingClassifier(random_state=42)  # Histogram-based splits
     elif model_type == 'xgb':
-        model = xgb.XGBClassifier(
+        # The number of trees is picked by early stopping inside each fit rather than
+        # searched as a grid dimension
+        model = _EarlyStoppingXGBClassifier(
+            n_estimators=500,
+            early_stopping_rounds=20,
             use_label_encoder=False,
-            eval_metric='logloss',
+            eval_metric='auc',
             random_state=42,
-            tree_method='hist'  # Faster training
+            tree_method='hist',  # Faster training
+            device='cuda' if use_gpu else 'cpu',
+            n_jobs=1  # Single-threaded per fit; GridSearchCV parallelizes across fits
         )
     else:
         raise ValueError(f"Unknown model type: {model_type}. Choose from ['logistic', 'rf', 'gb', 'xgb']")
     
+    # A single GPU cannot be shared efficiently across worker processes
+    if use_gpu:
+        n_jobs = 1
+    
     # Create time series cross-validation splitter
     tscv = TimeSeriesSplit(n_splits=n_splits)
     
-    # Create grid search with time series cross-validation
-    grid_search = GridSearchCV(
-        estimator=model,
-        param_grid=param_grid,
-        cv=tscv,
-        scoring='roc_auc',
-        n_jobs=n_jobs,
-        verbose=1
-    )
+    # Optionally move scaling into the search so it is fitted per fold and cached
+    if scaler_type is not None:
+        model = Pipeline(
+            [('scaler', _make_scaler(scaler_type)), ('clf', model)],
+            memory=Memory(cache_dir, verbose=0)
+        )
+        param_grid = {f'clf__{k}': v for k, v in param_grid.items()}
+    
+    def run_search(grid, refit: bool = True) -> GridSearchCV:
+        # Create grid search with time series cross-validation
+        search = GridSearchCV(
+            estimator=model,
+            param_grid=grid,
+            cv=tscv,
+            scoring='roc_auc',
+            n_jobs=n_jobs,
+            pre_dispatch='2*n_jobs',  # Bound the number of queued fits (and data copies) in flight
+            refit=refit,
+            return_train_score=False,  # Train scores are never used; skip scoring them
+            verbose=1
+        )
+        
+        # Fit grid search on combined train+val data. Limit each loky worker to a single
+        # native thread so XGBoost/OpenMP does not oversubscribe the cores joblib is using.
+        with parallel_backend('loky', n_jobs=n_jobs, inner_max_num_threads=1):
+            search.fit(X_train_val, y_train_val)
+        return search
+    
+    if search_strategy == 'grid':
+        grid_search = run_search(param_grid)
+        best_model = grid_search.best_estimator_
+        raw_best_params = grid_search.best_params_
+        best_val_score = grid_search.best_score_
+        cv_results_list = [grid_search.cv_results_]
+    elif search_strategy == 'coord_descent':
+        # Warm start from a small random sample of joint configurations
+        n_seeds = min(10, len(ParameterGrid(param_grid)))
+        seeds = ParameterSampler(param_grid, n_iter=n_seeds, random_state=42)
+        seed_search = run_search([{k: [v] for k, v in seed.items()} for seed in seeds], refit=False)
+        raw_best_params = seed_search.best_params_
+        best_val_score = seed_search.best_score_
+        cv_results_list = [seed_search.cv_results_]
+        
+        # Sweep one hyperparameter at a time, holding the others at their current best
+        for name, values in param_grid.items():
+            if len(values) < 2:
+                continue
+            sweep_grid = {k: [v] for k, v in raw_best_params.items()}
+            sweep_grid[name] = list(values)
+            sweep = run_search(sweep_grid, refit=False)
+            cv_results_list.append(sweep.cv_results_)
+            if sweep.best_score_ > best_val_score:
+                raw_best_params = sweep.best_params_
+                best_val_score = sweep.best_score_
+        
+        # Refit the selected configuration on the combined train+val data
+        best_model = clone(model).set_params(**raw_best_params).fit(X_train_val, y_train_val)
+    else:
+        raise ValueError(f"Unknown search strategy: {search_strategy}. Choose from ['grid', 'coord_descent']")
     
-    # Fit grid search on combined train+val data
-    grid_search.fit(X_train_val, y_train_val)
+    # The search pinned RF/XGB to one thread per fit; give the final model the full
+    # CPU budget back so later predict_proba calls run across trees in parallel
+    if model_type in ('rf', 'xgb') and not use_gpu:
+        final_estimator = best_model[-1] if isinstance(best_model, Pipeline) else best_model
+        final_estimator.set_params(n_jobs=n_jobs)
     
-    # Get best model and parameters
-    best_model = grid_search.best_estimator_
-    best_params = grid_search.best_params_
-    best_val_score = grid_search.best_score_
+    # Get best parameters
+    best_params = {k.replace('clf__', '', 1): v for k, v in raw_best_params.items()}
     
     print(f"\nBest parameters: {best_params}")
     print(f"Best cross-validation score: {best_val_score:.4f}")
+    if model_type == 'xgb':
+        xgb_model = best_model[-1] if isinstance(best_model, Pipeline) else best_model
+        if hasattr(xgb_model, 'best_iteration'):
+            print(f"Early stopping selected {xgb_model.best_iteration + 1} trees")
+        else:
+            print(f"Early stopping skipped (single-class eval tail); using all {xgb_model.n_estimators} trees")
+    
+    if cache_path is not None:
+        os.makedirs(model_cache_dir, exist_ok=True)
+        joblib.dump((best_model, best_val_score, best_params), cache_path)
     
     # Plot cross-validation results if requested
     if show_cv_plot:
+        import matplotlib.pyplot as plt
+        
         # Get top 10 parameter combinations by score
-        cv_results = pd.DataFrame(grid_search.cv_results_)
+        cv_results = pd.concat([pd.DataFrame(r) for r in cv_results_list], ignore_index=True)
+        cv_results = cv_results[~cv_results['params'].astype(str).duplicated()]
         top_results = cv_results.nlargest(10, 'mean_test_score')
         
         plt.figure(figsize=(10, 6))
@@ -264,12 +601,35 @@ def tune_hyperparameters(
     
     return best_model, best_val_score, best_params
 
+def _finish_plot(save_plots: bool, path: str) -> None:
+    """Save the current figure if save_plots is set, otherwise show it; then close it."""
+    import matplotlib.pyplot as plt
+    
+    if save_plots:
+        plt.savefig(path)
+    else:
+        plt.show()
+    plt.close()
+
+def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first. Uses a linear-time partition and
+    only sorts the selected entries, rather than sorting the whole array.
+    """
+    values = np.asarray(values)
+    k = min(k, len(values))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    top_idx = np.argpartition(-values, k - 1)[:k]
+    return top_idx[np.argsort(-values[top_idx], kind='stable')]
+
 def analyze_shap_values(
     model: Any,
     X: pd.DataFrame,
     model_type: str,
     save_plots: bool = False,
-    plot_dir: str = "logs"
+    plot_dir: str = "logs",
+    plot: bool = True
 ) -> Dict[str, Any]:
     """
     Analyze and visualize SHAP values for model explanation.
@@ -278,74 +638,146 @@ def analyze_shap_values(
         model: Trained model
         X: Feature DataFrame
         model_type: Type of model ('logistic', 'rf', 'gb', 'xgb')
-        save_plots: Whether to save plots to disk
+        save_plots: Whether to save plots to disk instead of showing them
         plot_dir: Directory to save plots if save_plots is True
+        plot: Whether to draw the SHAP summary plots
         
     Returns:
-        Dict containing SHAP values and feature importance
+        Dict containing SHAP values, the top 10 features ranked by mean absolute SHAP
+        value ('feature_importance'), and the mean absolute SHAP value of every feature
+        in column order ('mean_abs_shap')
     """
+    # shap and matplotlib are slow to import, so only load them when explaining a model
+    import shap
+    
     print(f"\nAnalyzing SHAP values for {model_type} model...")
     
+    # Explain the final estimator of a Pipeline on the transformed features
+    if isinstance(model, Pipeline):
+        X = pd.DataFrame(model[:-1].transform(X), columns=X.columns, index=X.index)
+        model = model[-1]
+    
     # Create SHAP explainer based on model type
     if model_type == 'logistic':
         explainer = shap.LinearExplainer(model, X)
     elif model_type in ['rf', 'gb', 'xgb']:
-        explainer = shap.TreeExplainer(model)
+        # Building a TreeExplainer parses every tree, so keep it on the model and reuse
+        # it when the same model is explained again (e.g. on val/test data)
+        explainer = getattr(model, '_shap_explainer', None)
+        if explainer is None:
+            explainer = shap.TreeExplainer(model)
+            model._shap_explainer = explainer
     else:
         raise ValueError(f"Unsupported model type for SHAP analysis: {model_type}")
     
     # Calculate SHAP values
     shap_values = explainer.shap_values(X)
     
-    # For binary classification, use values for positive class
+    # For binary classification, use values for positive class. Older SHAP releases
+    # return one array per class, newer ones a (samples, features, classes) array.
     if isinstance(shap_values, list):
         shap_values = shap_values[1]
+    elif shap_values.ndim == 3:
+        shap_values = shap_values[..., 1]
+    
+    # Calculate mean absolute SHAP values for feature importance; float32 is plenty
+    # for ranking features
+    mean_shap_values = np.abs(shap_values.astype(np.float32, copy=False)).mean(axis=0)
     
-    # Calculate mean absolute SHAP values for feature importance
-    mean_shap_values = np.abs(shap_values).mean(axis=0)
+    # Rank only the top 10 features instead of sorting all of them
+    top_idx = _top_k_indices(mean_shap_values, 10)
+    top_k = len(top_idx)
     feature_importance = pd.DataFrame({
-        'Feature': X.columns,
-        'Importance': mean_shap_values
-    }).sort_values('Importance', ascending=False)
-    
-    # Plot summary plot
-    plt.figure(figsize=(10, 6))
-    shap.summary_plot(
-        shap_values, 
-        X,
-        plot_type="bar",
-        show=False
-    )
-    plt.title(f"{model_type.upper()} - Feature Importance (SHAP)")
-    plt.tight_layout()
-    if save_plots:
-        plt.savefig(f"{plot_dir}/{model_type}_shap_summary.png")
-    plt.show()
-    plt.close()
+        'Feature': X.columns[top_idx],
+        'Importance': mean_shap_values[top_idx]
+    })
+    
+    if plot:
+        import matplotlib.pyplot as plt
+        
+        # Both plots share one Explanation and the feature order ranked above, so SHAP
+        # does not re-sort the value matrix for each of them. Features outside the top
+        # ranks only feed the "other features" row, so their order does not matter.
+        explanation = shap.Explanation(
+            values=shap_values,
+            data=X.to_numpy(),
+            feature_names=list(X.columns)
+        )
+        order = np.concatenate([top_idx, np.setdiff1d(np.arange(len(mean_shap_values)), top_idx)])
+        
+        # Plot summary plot
+        plt.figure(figsize=(10, 6))
+        shap.plots.bar(explanation, max_display=top_k, order=order, show=False)
+        plt.title(f"{model_type.upper()} - Feature Importance (SHAP)")
+        plt.tight_layout()
+        _finish_plot(save_plots, f"{plot_dir}/{model_type}_shap_summary.png")
+    
+        # Plot detailed SHAP values
+        plt.figure(figsize=(10, 6))
+        shap.plots.beeswarm(explanation, max_display=top_k, order=order, show=False)
+        plt.title(f"{model_type.upper()} - SHAP Value Distribution")
+        plt.tight_layout()
+        _finish_plot(save_plots, f"{plot_dir}/{model_type}_shap_distribution.png")
     
-    # Plot detailed SHAP values
-    plt.figure(figsize=(10, 6))
-    shap.summary_plot(
-        shap_values, 
-        X,
-        show=False
-    )
-    plt.title(f"{model_type.upper()} - SHAP Value Distribution")
-    plt.tight_layout()
-    if save_plots:
-        plt.savefig(f"{plot_dir}/{model_type}_shap_distribution.png")
-    plt.show()
-    plt.close()
     
     # Print top features by importance
-    print("\nTop 10 Most Important Features:")
-    print(feature_importance.head(10).to_string(index=False))
+    print(f"\nTop {top_k} Most Important Features:")
+    print(feature_importance.to_string(index=False))
     
     return {
         'shap_values': shap_values,
-        'feature_importance': feature_importance
+        'feature_importance': feature_importance,
+        'mean_abs_shap': mean_shap_values
     }
 
+# Above this many samples the plotted curves are built from score histograms
+_BINNED_CURVE_MIN_SAMPLES = 100_000
+
+def _binned_counts(y_true: pd.Series, y_prob: np.ndarray, n_bins: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cumulative positive and negative counts at n_bins descending score thresholds,
+    computed from histograms in O(N) instead of sorting the scores.
+    """
+    is_pos = np.asarray(y_true, dtype=bool)
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    pos = np.histogram(y_prob[is_pos], bins=edges)[0][::-1]
+    neg = np.histogram(y_prob[~is_pos], bins=edges)[0][::-1]
+    return np.cumsum(pos), np.cumsum(neg)
+
+def _plot_roc_curve(y_true: pd.Series, y_prob: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """False and true positive rates for plotting; binned for large datasets."""
+    if len(y_prob) < _BINNED_CURVE_MIN_SAMPLES:
+        fpr, tpr, _ = roc_curve(y_true, y_prob, drop_intermediate=True)
+        return fpr, tpr
+    tp, fp = _binned_counts(y_true, y_prob)
+    fpr = np.concatenate([[0.0], fp / max(fp[-1], 1)])
+    tpr = np.concatenate([[0.0], tp / max(tp[-1], 1)])
+    return fpr, tpr
+
+def _plot_precision_recall_curve(y_true: pd.Series, y_prob: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Precision and recall for plotting; binned for large datasets."""
+    if len(y_prob) < _BINNED_CURVE_MIN_SAMPLES:
+        precision, recall, _ = precision_recall_curve(y_true, y_prob, drop_intermediate=True)
+        return precision, recall
+    tp, fp = _binned_counts(y_true, y_prob)
+    predicted = tp + fp
+    keep = predicted > 0  # thresholds above every score predict nothing
+    # Match sklearn's ordering: increasing threshold, ending at precision 1, recall 0
+    precision = np.concatenate([(tp[keep] / predicted[keep])[::-1], [1.0]])
+    recall = np.concatenate([(tp[keep] / max(tp[-1], 1))[::-1], [0.0]])
+    return precision, recall
+
+def _predict_with_proba(model: Any, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Predict positive-class probabilities and derive class labels from them, so each
+    dataset is only run through the model once. Ties at 0.5 go to the negative class,
+    matching predict() for binary classifiers.
+    """
+    y_prob = model.predict_proba(X)[:, 1]
+    y_pred = (y_prob > 0.5).astype(np.int8)
+    # float32 is plenty for the metric and curve computations downstream
+    return y_pred, y_prob.astype(np.float32)
+
 def train_and_evaluate_model(
     model: Any,
     X_train: pd.DataFrame,
@@ -356,7 +788,9 @@ def train_and_evaluate_model(
     y_test: pd.Series,
     model_name: str,
     save_plots: bool = False,
-    plot_dir: str = "logs"
+    plot_dir: str = "logs",
+    already_fitted: bool = False,
+    plot: bool = True
 ) -> Tuple[Any, np.ndarray, Dict[str, float]]:
     """
     Train, evaluate and plot results for a classification model with overfitting analysis.
@@ -370,135 +804,156 @@ def train_and_evaluate_model(
         X_test: Test features
         y_test: Test labels
         model_name: Name of the model for display purposes
-        save_plots: Whether to save plots to disk. Defaults to False.
+        save_plots: Whether to save plots to disk instead of showing them. Defaults to False.
         plot_dir: Directory to save plots if save_plots is True. Defaults to "logs".
+        already_fitted: If True, skip fitting and evaluate the model as-is, e.g. a
+            GridSearchCV best_estimator_ that was already refit. Such a model was refit
+            on train+val, so validation metrics would be in-sample; they are skipped and
+            reported as None. Defaults to False.
+        plot: Whether to draw the evaluation and SHAP plots. Metrics and reports are
+            printed either way. Defaults to True.
         
     Returns:
         Tuple[Any, np.ndarray, Dict[str, float]]: 
             trained_model, test_predicted_probabilities, overfitting_report
     """
-    # Train the model
-    model.fit(X_train, y_train)
-    
-    # Make predictions on all datasets
-    y_train_pred = model.predict(X_train)
-    y_train_prob = model.predict_proba(X_train)[:, 1]
-    
-    y_val_pred = model.predict(X_val)
-    y_val_prob = model.predict_proba(X_val)[:, 1]
-    
-    y_test_pred = model.predict(X_test)
-    y_test_prob = model.predict_proba(X_test)[:, 1]
+    # Train the model unless it was already refit by the hyperparameter search
+    if not already_fitted:
+        model.fit(X_train, y_train)
+        # A SHAP explainer cached by an earlier analysis describes the old trees
+        estimator = model[-1] if isinstance(model, Pipeline) else model
+        estimator.__dict__.pop('_shap_explainer', None)
+    
+    # The validation set is only held out if the model was not refit on train+val
+    has_val = not already_fitted
+    
+    # Make predictions on all datasets (one probability pass per dataset)
+    y_train_pred, y_train_prob = _predict_with_proba(model, X_train)
+    if has_val:
+        y_val_pred, y_val_prob = _predict_with_proba(model, X_val)
+    y_test_pred, y_test_prob = _predict_with_proba(model, X_test)
     
     # Calculate metrics for all datasets
     train_accuracy = accuracy_score(y_train, y_train_pred)
-    val_accuracy = accuracy_score(y_val, y_val_pred)
+    val_accuracy = accuracy_score(y_val, y_val_pred) if has_val else None
     test_accuracy = accuracy_score(y_test, y_test_pred)
     
     train_roc_auc = roc_auc_score(y_train, y_train_prob)
-    val_roc_auc = roc_auc_score(y_val, y_val_prob)
+    val_roc_auc = roc_auc_score(y_val, y_val_prob) if has_val else None
     test_roc_auc = roc_auc_score(y_test, y_test_prob)
     
     # Print overfitting analysis
     print(f"\n{model_name} - Overfitting Analysis:")
     print(f"  Training set - Accuracy: {train_accuracy:.4f}, ROC AUC: {train_roc_auc:.4f}")
-    print(f"  Validation set - Accuracy: {val_accuracy:.4f}, ROC AUC: {val_roc_auc:.4f}")
+    if has_val:
+        print(f"  Validation set - Accuracy: {val_accuracy:.4f}, ROC AUC: {val_roc_auc:.4f}")
+    else:
+        print("  Validation set - skipped (model was refit on train+val)")
     print(f"  Test set - Accuracy: {test_accuracy:.4f}, ROC AUC: {test_roc_auc:.4f}")
     
     # Calculate overfitting metrics
-    train_val_acc_diff = train_accuracy - val_accuracy
+    train_val_acc_diff = train_accuracy - val_accuracy if has_val else None
     train_test_acc_diff = train_accuracy - test_accuracy
-    train_val_auc_diff = train_roc_auc - val_roc_auc
+    train_val_auc_diff = train_roc_auc - val_roc_auc if has_val else None
     train_test_auc_diff = train_roc_auc - test_roc_auc
     
-    print(f"  Accuracy Gap (Train-Val): {train_val_acc_diff:.4f}, (Train-Test): {train_test_acc_diff:.4f}")
-    print(f"  ROC AUC Gap (Train-Val): {train_val_auc_diff:.4f}, (Train-Test): {train_test_auc_diff:.4f}")
+    if has_val:
+        print(f"  Accuracy Gap (Train-Val): {train_val_acc_diff:.4f}, (Train-Test): {train_test_acc_diff:.4f}")
+        print(f"  ROC AUC Gap (Train-Val): {train_val_auc_diff:.4f}, (Train-Test): {train_test_auc_diff:.4f}")
+    else:
+        print(f"  Accuracy Gap (Train-Test): {train_test_acc_diff:.4f}")
+        print(f"  ROC AUC Gap (Train-Test): {train_test_auc_diff:.4f}")
     
     # Print classification report for test set
     print(f"\n{model_name} - Test Set Classification Report:")
     print(classification_report(y_test, y_test_pred))
     
-    # Plot confusion matrix
-    plt.figure(figsize=(8, 6))
-    cm = confusion_matrix(y_test, y_test_pred)
-    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-                xticklabels=['No Crash', 'Crash'], 
-                yticklabels=['No Crash', 'Crash'])
-    plt.title(f'{model_name} - Confusion Matrix')
-    plt.ylabel('True Label')
-    plt.xlabel('Predicted Label')
-    plt.tight_layout()
-    if save_plots:
-        plt.savefig(f"{plot_dir}/{model_name.lower().replace(' ', '_')}_confusion_matrix.png")
-    plt.show()
-    plt.close()
-    
-    # Plot ROC curves for all datasets to visualize overfitting
-    plt.figure(figsize=(10, 8))
-    
-    # Training set ROC
-    fpr_train, tpr_train, _ = roc_curve(y_train, y_train_prob)
-    plt.plot(fpr_train, tpr_train, 'b-', label=f'Training (AUC = {train_roc_auc:.2f})')
-    
-    # Validation set ROC
-    fpr_val, tpr_val, _ = roc_curve(y_val, y_val_prob)
-    plt.plot(fpr_val, tpr_val, 'g-', label=f'Validation (AUC = {val_roc_auc:.2f})')
-    
-    # Test set ROC
-    fpr_test, tpr_test, _ = roc_curve(y_test, y_test_prob)
-    plt.plot(fpr_test, tpr_test, 'r-', label=f'Test (AUC = {test_roc_auc:.2f})')
-    
-    # Reference line
-    plt.plot([0, 1], [0, 1], 'k--', lw=2)
-    
-    plt.xlim([0.0, 1.0])
-    plt.ylim([0.0, 1.05])
-    plt.xlabel('False Positive Rate')
-    plt.ylabel('True Positive Rate')
-    plt.title(f'{model_name} - ROC Curves (Overfitting Analysis)')
-    plt.legend(loc="lower right")
-    if save_plots:
-        plt.savefig(f"{plot_dir}/{model_name.lower().replace(' ', '_')}_roc_curve.png")
-    plt.show()
-    plt.close()
-    
-    # Plot precision-recall curve for test set
-    plt.figure(figsize=(8, 6))
-    precision, recall, _ = precision_recall_curve(y_test, y_test_prob)
-    avg_precision = average_precision_score(y_test, y_test_prob)
-    
-    plt.plot(recall, precision, lw=2, label=f'Precision-Recall (AP = {avg_precision:.2f})')
-    plt.axhline(y=y_test.mean(), color='r', linestyle='--', 
-                label=f'Baseline (Class frequency: {y_test.mean():.2%})')
-    
-    plt.xlim([0.0, 1.0])
-    plt.ylim([0.0, 1.05])
-    plt.xlabel('Recall')
-    plt.ylabel('Precision')
-    plt.title(f'{model_name} - Precision-Recall Curve')
-    plt.legend(loc="best")
-    if save_plots:
-        plt.savefig(f"{plot_dir}/{model_name.lower().replace(' ', '_')}_precision_recall.png")
-    plt.show()
-    plt.close()
-    
-    # For tree-based models, plot feature importance
-    if hasattr(model, 'feature_importances_'):
-        # Get feature importances
-        importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1]
-        features = X_train.columns
+    if plot:
+        import matplotlib.pyplot as plt
         
-        # Plot feature importances
-        plt.figure(figsize=(12, 8))
-        plt.title(f'{model_name} - Feature Importances')
-        plt.bar(range(X_train.shape[1]), importances[indices], align='center')
-        plt.xticks(range(X_train.shape[1]), [features[i] for i in indices], rotation=90)
+        # Plot confusion matrix
+        fig, ax = plt.subplots(figsize=(8, 6))
+        cm = confusion_matrix(y_test, y_test_pred)
+        im = ax.imshow(cm, cmap='Blues')
+        fig.colorbar(im, ax=ax)
+        for i, j in np.ndindex(cm.shape):
+            ax.text(j, i, str(cm[i, j]), ha='center', va='center',
+                    color='white' if cm[i, j] > cm.max() / 2 else 'black')
+        ax.set_xticks(range(2), ['No Crash', 'Crash'])
+        ax.set_yticks(range(2), ['No Crash', 'Crash'])
+        plt.title(f'{model_name} - Confusion Matrix')
+        plt.ylabel('True Label')
+        plt.xlabel('Predicted Label')
         plt.tight_layout()
-        if save_plots:
-            plt.savefig(f"{plot_dir}/{model_name.lower().replace(' ', '_')}_feature_importance.png")
-        plt.show()
-        plt.close()
+        _finish_plot(save_plots, f"{plot_dir}/{model_name.lower().replace(' ', '_')}_confusion_matrix.png")
+    
+        # A constant score vector gives a trivial diagonal ROC and a flat PR curve,
+        # so skip building and drawing them
+        if np.ptp(y_test_prob) < 1e-12:
+            print(f"{model_name} predicts a constant probability on the test set; skipping ROC and precision-recall plots")
+        else:
+            # Plot ROC curves for all datasets to visualize overfitting
+            plt.figure(figsize=(10, 8))
+    
+            # Training set ROC
+            fpr_train, tpr_train = _plot_roc_curve(y_train, y_train_prob)
+            plt.plot(fpr_train, tpr_train, 'b-', label=f'Training (AUC = {train_roc_auc:.2f})')
+    
+            # Validation set ROC
+            if has_val:
+                fpr_val, tpr_val = _plot_roc_curve(y_val, y_val_prob)
+                plt.plot(fpr_val, tpr_val, 'g-', label=f'Validation (AUC = {val_roc_auc:.2f})')
+    
+            # Test set ROC
+            fpr_test, tpr_test = _plot_roc_curve(y_test, y_test_prob)
+            plt.plot(fpr_test, tpr_test, 'r-', label=f'Test (AUC = {test_roc_auc:.2f})')
+    
+            # Reference line
+            plt.plot([0, 1], [0, 1], 'k--', lw=2)
+    
+            plt.xlim([0.0, 1.0])
+            plt.ylim([0.0, 1.05])
+            plt.xlabel('False Positive Rate')
+            plt.ylabel('True Positive Rate')
+            plt.title(f'{model_name} - ROC Curves (Overfitting Analysis)')
+            plt.legend(loc="lower right")
+            _finish_plot(save_plots, f"{plot_dir}/{model_name.lower().replace(' ', '_')}_roc_curve.png")
+    
+            # Plot precision-recall curve for test set
+            plt.figure(figsize=(8, 6))
+            precision, recall = _plot_precision_recall_curve(y_test, y_test_prob)
+            avg_precision = average_precision_score(y_test, y_test_prob)
+    
+            plt.plot(recall, precision, lw=2, label=f'Precision-Recall (AP = {avg_precision:.2f})')
+            plt.axhline(y=y_test.mean(), color='r', linestyle='--', 
+                        label=f'Baseline (Class frequency: {y_test.mean():.2%})')
+    
+            plt.xlim([0.0, 1.0])
+            plt.ylim([0.0, 1.05])
+            plt.xlabel('Recall')
+            plt.ylabel('Precision')
+            plt.title(f'{model_name} - Precision-Recall Curve')
+            plt.legend(loc="best")
+            _finish_plot(save_plots, f"{plot_dir}/{model_name.lower().replace(' ', '_')}_precision_recall.png")
+    
+        # For tree-based models, plot feature importance
+        if hasattr(model, 'feature_importances_'):
+            # Get feature importances
+            importances = model.feature_importances_
+            features = X_train.columns
+            
+            # Only the top 20 features are shown
+            indices = _top_k_indices(importances, 20)
+            top_k = len(indices)
+        
+            # Plot feature importances
+            plt.figure(figsize=(12, 8))
+            plt.title(f'{model_name} - Feature Importances')
+            plt.bar(range(top_k), importances[indices], align='center')
+            plt.xticks(range(top_k), [features[i] for i in indices], rotation=90)
+            plt.tight_layout()
+            _finish_plot(save_plots, f"{plot_dir}/{model_name.lower().replace(' ', '_')}_feature_importance.png")
+    
     
     # Add SHAP analysis
     model_type = model_name.lower().split()[0]  # Extract model type from name
@@ -507,7 +962,8 @@ def train_and_evaluate_model(
         X_train,  # Use training data for SHAP analysis
         model_type,
         save_plots,
-        plot_dir
+        plot_dir,
+        plot=plot
     )
     
     # Create overfitting report
@@ -527,6 +983,53 @@ def train_and_evaluate_model(
     
     return model, y_test_prob, overfitting_report
 
+def _tune_and_evaluate(
+    model_type: str,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    param_grid: Dict[str, Any],
+    n_splits: int,
+    n_jobs: int,
+    use_gpu: bool,
+    search_strategy: str,
+    model_cache_dir: str,
+    train_val: Tuple[pd.DataFrame, pd.Series],
+    save_plots: bool,
+    plot_dir: str
+) -> Tuple[Any, np.ndarray, Dict[str, float], Dict[str, Any]]:
+    """Tune and evaluate a single model type for train_and_evaluate_all_models."""
+    print(f"\nTraining {model_type.upper()} model...")
+    
+    # Tune hyperparameters
+    model, val_score, params = tune_hyperparameters(
+        X_train, y_train, X_val, y_val, model_type,
+        n_splits=n_splits,
+        n_jobs=n_jobs,
+        param_grid=param_grid,
+        use_gpu=use_gpu,
+        search_strategy=search_strategy,
+        model_cache_dir=model_cache_dir,
+        train_val=train_val
+    )
+    
+    print(f"Best parameters for {model_type}: {params}")
+    
+    # Evaluate the best model; GridSearchCV has already refit it on train+val
+    model, probs, overfitting_report = train_and_evaluate_model(
+        model, X_train, y_train, X_val, y_val, X_test, y_test,
+        f"{model_type.upper()} (params: {params})",
+        save_plots=save_plots,
+        plot_dir=plot_dir,
+        already_fitted=True,
+        plot=save_plots
+    )
+    
+    return model, probs, overfitting_report, params
+
 def train_and_evaluate_all_models(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -535,10 +1038,16 @@ def train_and_evaluate_all_models(
     X_test: pd.DataFrame,
     y_test: pd.Series,
     model_types: List[str] = ['logistic', 'rf', 'gb', 'xgb'],
-    fast_mode: bool = False
+    fast_mode: bool = False,
+    use_gpu: bool = False,
+    search_strategy: str = 'grid',
+    model_cache_dir: str = None,
+    n_jobs: int = -1,
+    save_plots: bool = False,
+    plot_dir: str = "logs"
 ) -> Dict[str, Tuple[Any, np.ndarray, Dict[str, float], Dict[str, Any]]]:
     """
-    Train and evaluate multiple models in sequence.
+    Train and evaluate multiple models in parallel.
     
     Args:
         X_train: Training features
@@ -549,13 +1058,20 @@ def train_and_evaluate_all_models(
         y_test: Test labels
         model_types: List of model types to train. Defaults to ['logistic', 'rf', 'gb', 'xgb']
         fast_mode: If True, uses fewer hyperparameters and CV splits for faster results
+        use_gpu: If True, trains XGBoost on a CUDA device when available
+        search_strategy: Hyperparameter search strategy ('grid' or 'coord_descent')
+        model_cache_dir: If set, tuned models are cached there and reused on re-runs
+        n_jobs: Total number of CPUs shared between the model types. Defaults to -1 (all processors).
+        save_plots: If True, draw the evaluation and SHAP plots of every model and save them
+            under plot_dir. Plots are skipped entirely otherwise. Defaults to False.
+        plot_dir: Directory to save plots if save_plots is True. Defaults to "logs".
         
     Returns:
         Dict[str, Tuple[Any, np.ndarray, Dict[str, float], Dict[str, Any]]]: 
             Dictionary mapping model names to (model, test_probabilities, overfitting_report, best_params)
     """
     # Calculate class weight for imbalanced data
-    class_weight = sum(y_train==0)/sum(y_train==1)
+    class_weight = _negative_to_positive_ratio(y_train)
     
     # Define parameter grids for each model type
     if fast_mode:
@@ -575,14 +1091,12 @@ def train_and_evaluate_all_models(
                 'max_features': ['sqrt']
             },
             'gb': {
-                'n_estimators': [20],  # Reduced to number of features
+                'max_iter': [20],  # Reduced to number of features
                 'learning_rate': [0.1],  # Single value
                 'max_depth': [3],  # Single value
-                'subsample': [0.8],
-                'max_features': ['sqrt']
+                'class_weight': ['balanced']
             },
             'xgb': {
-                'n_estimators': [20],  # Reduced to number of features
                 'max_depth': [3],  # Single value
                 'learning_rate': [0.1],  # Single value
                 'subsample': [0.8],
@@ -611,18 +1125,14 @@ def train_and_evaluate_all_models(
                 'criterion': ['gini']  # Removed entropy since gini is usually sufficient
             },
             'gb': {
-                'n_estimators': [20, 50],  # Reduced to be proportional to feature count
+                'max_iter': [20, 50],  # Number of boosting iterations
                 'learning_rate': [0.1, 0.2],  # Reduced from 3 to 2 values
                 'max_depth': [3, 5],  # Reduced from 3 to 2 values
-                'min_samples_split': [2, 5],  # Reduced from 3 to 2 values
-                'min_samples_leaf': [1, 2],  # Reduced from 3 to 2 values
-                'subsample': [0.8, 1.0],
-                'loss': ['deviance'],  # Removed exponential
-                'max_features': ['sqrt'],  # Removed log2
-                'criterion': ['friedman_mse']  # Removed squared_error
+                'min_samples_leaf': [10, 20],  # Histogram trees need larger leaves
+                'l2_regularization': [0, 0.1],
+                'class_weight': ['balanced', None]
             },
             'xgb': {
-                'n_estimators': [20, 50],  # Reduced to be proportional to feature count
                 'max_depth': [3, 5],  # Reduced from 3 to 2 values
                 'learning_rate': [0.1, 0.2],  # Reduced from 3 to 2 values
                 'subsample': [0.8, 1.0],
@@ -636,28 +1146,33 @@ def train_and_evaluate_all_models(
         }
         n_splits = 3  # More CV splits for better results
     
-    results = {}
+    # Run the model types concurrently and split the CPU budget between them so the
+    # inner grid searches do not oversubscribe the machine
+    total_jobs = cpu_count() if n_jobs == -1 else n_jobs
+    outer_jobs = max(1, min(len(model_types), total_jobs))
+    inner_jobs = max(1, total_jobs // outer_jobs)
     
-    for model_type in model_types:
-        print(f"\nTraining {model_type.upper()} model...")
-        
-        # Tune hyperparameters
-        model, val_score, params = tune_hyperparameters(
-            X_train, y_train, X_val, y_val, model_type,
+    # Stack train+val once and share it between the model types
+    train_val = _stack_train_val(X_train, y_train, X_val, y_val)
+    
+    outputs = Parallel(n_jobs=outer_jobs, backend='loky')(
+        delayed(_tune_and_evaluate)(
+            model_type, X_train, y_train, X_val, y_val, X_test, y_test,
+            param_grid=param_grids[model_type],
             n_splits=n_splits,
-            param_grid=param_grids[model_type]
-        )
-        
-        print(f"Best parameters for {model_type}: {params}")
-        
-        # Train and evaluate using the model with best parameters
-        model, probs, overfitting_report = train_and_evaluate_model(
-            model, X_train, y_train, X_val, y_val, X_test, y_test,
-            f"{model_type.upper()} (params: {params})"
+            n_jobs=inner_jobs,
+            use_gpu=use_gpu,
+            search_strategy=search_strategy,
+            model_cache_dir=model_cache_dir,
+            train_val=train_val,
+            save_plots=save_plots,
+            plot_dir=plot_dir
         )
-        
-        # Store results including best parameters
-        results[model_type] = (model, probs, overfitting_report, params)
+        for model_type in model_types
+    )
+    
+    # Store results including best parameters
+    results = dict(zip(model_types, outputs))
     
     return results
 
@@ -686,13 +1201,9 @@ def generate_model_explanation_prompt(
         str: Prompt text for LLM
     """
     # Get top N features by absolute SHAP value
-    feature_importance = pd.DataFrame({
-        'Feature': feature_names,
-        'Value': features.values,
-        'SHAP': shap_values
-    })
-    feature_importance['Abs_SHAP'] = np.abs(feature_importance['SHAP'])
-    top_features = feature_importance.nlargest(top_n_features, 'Abs_SHAP')
+    shap_values = np.asarray(shap_values)
+    feature_values = features.to_numpy()
+    top_idx = _top_k_indices(np.abs(shap_values), top_n_features)
     
     # Format the prompt
     prompt = f"""Context:
@@ -711,8 +1222,8 @@ Top {top_n_features} Influential Features:
 """
     
     # Add each top feature's details
-    for _, row in top_features.iterrows():
-        prompt += f"- {row['Feature']}: Value = {row['Value']:.3f}, SHAP Impact = {row['SHAP']:.3f}\n"
+    for i in top_idx:
+        prompt += f"- {feature_names[i]}: Value = {feature_values[i]:.3f}, SHAP Impact = {shap_values[i]:.3f}\n"
     
     prompt += """
 Please explain:
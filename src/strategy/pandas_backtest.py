@@ -1,9 +1,20 @@
 import pandas as pd
 import numpy as np
-from scipy import stats
+from scipy.special import ndtr
 import matplotlib.pyplot as plt
 from typing import Tuple, Dict, Any
 
+# numba is optional; without it the simulation loop runs as plain Python over NumPy arrays
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Exit codes written by _simulate_option_strategy, and the exit_type label of each
+_EXIT_NONE, _EXIT_EXPIRY, _EXIT_THRESHOLD, _EXIT_STILL_ACTIVE = 0, 1, 2, 3
+_EXIT_TYPES = ["", "expiry", "threshold_exit", "still_active"]
+
 def estimate_put_option_price(S: float, K: float, T: float, r: float, sigma: float, dividend_yield: float = 0.0) -> float:
     """
     Estimate the price of a put option using the Black-Scholes model.
@@ -20,229 +31,278 @@ def estimate_put_option_price(S: float, K: float, T: float, r: float, sigma: flo
         Put option price
     """
     # Black-Scholes formula for put option
-    d1 = (np.log(S / K) + (r - dividend_yield + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
+    vol_sqrt_T = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r - dividend_yield + 0.5 * sigma**2) * T) / vol_sqrt_T
+    d2 = d1 - vol_sqrt_T
     
-    put_price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * np.exp(-dividend_yield * T) * stats.norm.cdf(-d1)
+    # ndtr is the standard normal CDF without the rv_continuous dispatch of stats.norm.cdf
+    put_price = K * np.exp(-r * T) * ndtr(-d2) - S * np.exp(-dividend_yield * T) * ndtr(-d1)
     
     return put_price
 
-def backtest_option_strategy(model_probs, actual_crashes, spy_prices, vix_values, threshold=0.5, strike_pct=0.95, option_expiry_days=int(252 / 12)):
+def _put_price_table(spy_prices: np.ndarray, vix_values: np.ndarray, entry_days: np.ndarray, strike_pct: float, option_expiry_days: int, r: float) -> np.ndarray:
     """
-    Backtest a strategy that buys put options when crash probability exceeds threshold.
-    
-    Strategy:
-    - When crash probability exceeds threshold AND we don't already have an active option,
-      buy a put option with strike at strike_pct of current price
-    - Sell option when probability falls below threshold (or at expiration)
-    - Option is valued at each time step using Black-Scholes pricing
+    Price every put the strategy could hold, in one vectorized Black-Scholes pass.
     
-    Args:
-        model_probs: Series of model crash probabilities
-        actual_crashes: Series of actual crash labels
-        spy_prices: Series of SPY prices
-        vix_values: Series of VIX values (used for implied volatility)
-        threshold: Probability threshold for buying options (default: 0.5)
-        strike_pct: Strike price as percentage of current price (default: 0.9 = 10% OTM)
-        option_expiry_days: Days until option expiration (default: 21 trading days)
-        
-    Returns:
-        DataFrame: Strategy results
+    Row k is a put bought on day entry_days[k] with strike spy_prices[entry_days[k]] * strike_pct;
+    column d is its value d days after entry (d = 0 is the entry price). Days past the end of
+    the series are NaN.
     """
-    # model_probs = pd.Series(rf_probs, index=X_test.index)
-    # actual_crashes = y_test
-    # spy_prices = spy_prices
-    # threshold=0.6
-    # strike_pct=0.9
-    # option_expiry_days= int(252 / 12)
-    
-    # Interest rate assumption
-    risk_free_rate = 0.02
-    # Option coverage
-    option_coverage = 1.0  # Protect 30% of the portfolio
+    n = len(spy_prices)
+    offsets = np.arange(option_expiry_days)
+    eval_idx = entry_days[:, None] + offsets[None, :]
+    in_range = eval_idx < n
+    eval_idx = np.where(in_range, eval_idx, 0)
+    
+    S = np.where(in_range, spy_prices[eval_idx], np.nan)
+    sigma = np.where(in_range, vix_values[eval_idx] / 100, np.nan)
+    K = (spy_prices[entry_days] * strike_pct)[:, None]
+    T = (option_expiry_days - offsets)[None, :] / 252
+    
+    return estimate_put_option_price(S=S, K=K, T=T, r=r, sigma=sigma)
+
+def _simulate_option_strategy(signal, prob, spy_prices, price_table, table_row, threshold, strike_pct, option_expiry_days, option_coverage):
+    """
+    Day-by-day state machine of the put strategy over plain arrays.
     
-    # Initialize strategy DataFrame
-    strategy = pd.DataFrame({
-        'date': model_probs.index,
-        'spy_price': spy_prices,
-        'spy_return': spy_prices.pct_change(),
-        'vix': vix_values,
-        'prob': model_probs,
-        'actual_crash': actual_crashes,
-        'signal': (model_probs >= threshold).astype(int),
-        'stock_balance': spy_prices,
-    })
-    strategy['has_active_option'] = False
-    strategy['option_start_idx'] = -1
-    strategy['option_expiry_idx'] = -1
-    strategy['strike_price'] = np.nan
-    strategy['option_price'] = np.nan
-    strategy['option_cost'] = np.nan
-    strategy['option_balance'] = 0.0
-    strategy['cash_balance'] = 0.0 # cash to track option PNL, given no stock trade
-    strategy['exit_type'] = ""  # "expiry", "threshold_exit", "still_active"
-    strategy['strategy_balance'] = 0.0
-    strategy['strategy_return'] = 0.0
-    strategy['cum_strategy_dollar_return'] = 0.0
-    strategy['cum_strategy_return'] = 0.0
+    Option prices come from the table built by _put_price_table; table_row maps a signal
+    day to its row in that table (-1 on days without a signal). Returns one array per
+    output column, plus the number of positions opened; exit codes index _EXIT_TYPES.
+    """
+    n = len(signal)
+    has_active_option = np.zeros(n, dtype=np.bool_)
+    option_start_idx_arr = np.full(n, -1, dtype=np.int64)
+    option_expiry_idx_arr = np.full(n, -1, dtype=np.int64)
+    strike_price_arr = np.full(n, np.nan)
+    option_price_arr = np.full(n, np.nan)
+    option_cost_arr = np.full(n, np.nan)
+    option_balance_arr = np.zeros(n)
+    cash_balance_arr = np.zeros(n)
+    exit_code_arr = np.zeros(n, dtype=np.int8)
     
-    # Simulate the strategy
     active_option = False
     option_start_idx = -1
     option_expiry_idx = -1
     strike_price = np.nan
-    entry_option_price = np.nan
+    option_cost = np.nan
+    option_entries = 0
     
-    for i in range(len(strategy)):
-        current_date = strategy.iloc[i].date
-        current_price = strategy.iloc[i]['spy_price']
-        current_prob = strategy.iloc[i]['prob']
-
+    for i in range(n):
+        current_price = spy_prices[i]
+        
         if i > 0:
             # initial position of cash balance for every day may change later
-            strategy.iloc[i, strategy.columns.get_loc('cash_balance')] = strategy.iloc[i-1]['cash_balance']
+            cash_balance_arr[i] = cash_balance_arr[i - 1]
         
         # Check if we have an active option
         if active_option:
             # Mark this day as having an active option
-            strategy.iloc[i, strategy.columns.get_loc('has_active_option')] = True
-            strategy.iloc[i, strategy.columns.get_loc('option_start_idx')] = option_start_idx
-            strategy.iloc[i, strategy.columns.get_loc('option_expiry_idx')] = option_expiry_idx
-            strategy.iloc[i, strategy.columns.get_loc('strike_price')] = strike_price
-            strategy.iloc[i, strategy.columns.get_loc('option_cost')] = option_cost
+            has_active_option[i] = True
+            option_start_idx_arr[i] = option_start_idx
+            option_expiry_idx_arr[i] = option_expiry_idx
+            strike_price_arr[i] = strike_price
+            option_cost_arr[i] = option_cost
             
-            # Calculate current option value using Black-Scholes
-            remaining_days = option_expiry_idx - i
-            if remaining_days > 0:
+            # Value the option from the precomputed Black-Scholes table
+            if option_expiry_idx - i > 0:
                 # Option still has time value
-                days_to_expiry = remaining_days / 252  # Convert to years
-                implied_vol = strategy.iloc[i]['vix'] / 100
-                
-                # Calculate current option price
-                current_option_price = estimate_put_option_price(
-                    S=current_price,
-                    K=strike_price,
-                    T=days_to_expiry,
-                    r=risk_free_rate,
-                    sigma=implied_vol
-                )
+                current_option_price = price_table[table_row[option_start_idx], i - option_start_idx]
+                option_price_arr[i] = current_option_price
+                option_balance_arr[i] = current_option_price * option_coverage
                 
-                strategy.iloc[i, strategy.columns.get_loc('option_price')] = current_option_price
-                strategy.iloc[i, strategy.columns.get_loc('option_balance')] = current_option_price * option_coverage    
-                                
                 # Check if we should exit based on threshold
-                if current_prob < threshold and current_option_price > option_cost:
-                    # Exit the position as probability is below threshold                
-                    strategy.iloc[i, strategy.columns.get_loc('exit_type')] = "threshold_exit"
-                    strategy.iloc[i, strategy.columns.get_loc('cash_balance')] += current_option_price * option_coverage
-                    strategy.iloc[i, strategy.columns.get_loc('option_balance')] = 0 
+                if prob[i] < threshold and current_option_price > option_cost:
+                    # Exit the position as probability is below threshold
+                    exit_code_arr[i] = _EXIT_THRESHOLD
+                    cash_balance_arr[i] += current_option_price * option_coverage
+                    option_balance_arr[i] = 0.0
                     active_option = False
-                    continue  
+                    continue
             
             # Check if option is expiring today
             if i == option_expiry_idx:
                 # Calculate payoff at expiration (intrinsic value only)
-                payoff = max(0, strike_price - current_price)
+                payoff = max(0.0, strike_price - current_price)
                 
                 # Record the final payoff
-                strategy.iloc[i, strategy.columns.get_loc('option_price')] = payoff # this is daily backtesting, so no time value
-                strategy.iloc[i, strategy.columns.get_loc('cash_balance')] += payoff * option_coverage
-                strategy.iloc[i, strategy.columns.get_loc('option_balance')] = 0
-                strategy.iloc[i, strategy.columns.get_loc('exit_type')] = "expiry"
+                option_price_arr[i] = payoff # this is daily backtesting, so no time value
+                cash_balance_arr[i] += payoff * option_coverage
+                option_balance_arr[i] = 0.0
+                exit_code_arr[i] = _EXIT_EXPIRY
                 
                 # Close the position
                 active_option = False
         
         # Check if we should open a new position (only if no active option)
-        elif strategy.iloc[i]['signal'] == 1:
+        elif signal[i]:
             # Calculate option parameters
-            implied_vol = strategy.iloc[i]['vix'] / 100
             strike_price = current_price * strike_pct
-            
-            # Calculate option price
-            entry_option_price = estimate_put_option_price(
-                S=current_price,
-                K=strike_price,
-                T=option_expiry_days/252,  # Convert to years
-                r=risk_free_rate,
-                sigma=implied_vol
-            )
+            entry_option_price = price_table[table_row[i], 0]
             
             # Calculate cost as percentage of portfolio
             option_cost = entry_option_price * option_coverage
             
             # Record option details
             active_option = True
+            option_entries += 1
             option_start_idx = i
             option_expiry_idx = i + option_expiry_days
             
-            # Record in the strategy DataFrame
-            strategy.iloc[i, strategy.columns.get_loc('has_active_option')] = True
-            strategy.iloc[i, strategy.columns.get_loc('option_start_idx')] = option_start_idx
-            strategy.iloc[i, strategy.columns.get_loc('option_expiry_idx')] = option_expiry_idx
-            strategy.iloc[i, strategy.columns.get_loc('strike_price')] = strike_price
-            strategy.iloc[i, strategy.columns.get_loc('option_price')] = entry_option_price
-            strategy.iloc[i, strategy.columns.get_loc('option_cost')] = option_cost
-            strategy.iloc[i, strategy.columns.get_loc('option_balance')] = option_cost
-            strategy.iloc[i, strategy.columns.get_loc('cash_balance')] -= option_cost
+            has_active_option[i] = True
+            option_start_idx_arr[i] = option_start_idx
+            option_expiry_idx_arr[i] = option_expiry_idx
+            strike_price_arr[i] = strike_price
+            option_price_arr[i] = entry_option_price
+            option_cost_arr[i] = option_cost
+            option_balance_arr[i] = option_cost
+            cash_balance_arr[i] -= option_cost
+    
+    return (
+        has_active_option, option_start_idx_arr, option_expiry_idx_arr, strike_price_arr,
+        option_price_arr, option_cost_arr, option_balance_arr, cash_balance_arr, exit_code_arr,
+        option_entries
+    )
+
+if HAS_NUMBA:
+    _simulate_option_strategy = njit(cache=True)(_simulate_option_strategy)
+
+def _drawdown_duration(drawdown: pd.Series) -> pd.Series:
+    """
+    Number of consecutive periods spent below the running peak, resetting to 0 on
+    recovery. The first period always counts as 0.
+    """
+    in_drawdown = (drawdown < 0).astype(int)
+    in_drawdown.iloc[0] = 0
+    # Each period out of drawdown starts a new group; count within groups
+    recovery_id = (in_drawdown == 0).cumsum()
+    return in_drawdown.groupby(recovery_id).cumcount() * in_drawdown
+
+def backtest_option_strategy(model_probs, actual_crashes, spy_prices, vix_values, threshold=0.5, strike_pct=0.95, option_expiry_days=int(252 / 12)):
+    """
+    Backtest a strategy that buys put options when crash probability exceeds threshold.
+    
+    Strategy:
+    - When crash probability exceeds threshold AND we don't already have an active option,
+      buy a put option with strike at strike_pct of current price
+    - Sell option when probability falls below threshold (or at expiration)
+    - Option is valued at each time step using Black-Scholes pricing
+    
+    Args:
+        model_probs: Series of model crash probabilities
+        actual_crashes: Series of actual crash labels
+        spy_prices: Series of SPY prices
+        vix_values: Series of VIX values (used for implied volatility)
+        threshold: Probability threshold for buying options (default: 0.5)
+        strike_pct: Strike price as percentage of current price (default: 0.9 = 10% OTM)
+        option_expiry_days: Days until option expiration (default: 21 trading days)
+        
+    Returns:
+        DataFrame: Strategy results
+    """
+    # model_probs = pd.Series(rf_probs, index=X_test.index)
+    # actual_crashes = y_test
+    # spy_prices = spy_prices
+    # threshold=0.6
+    # strike_pct=0.9
+    # option_expiry_days= int(252 / 12)
+    
+    # Interest rate assumption
+    risk_free_rate = 0.02
+    # Option coverage
+    option_coverage = 1.0  # Protect 30% of the portfolio
+    
+    # Work on plain arrays; the inputs share one date index
+    spy = spy_prices.to_numpy(dtype=np.float64)
+    vix = vix_values.to_numpy(dtype=np.float64)
+    prob = model_probs.to_numpy(dtype=np.float64)
+    signal = (prob >= threshold).astype(np.int8)
+    
+    # Price every candidate option up front; the loop below only looks prices up.
+    # Positions can only be opened on signal days, so only those rows are priced.
+    entry_days = np.flatnonzero(signal)
+    table_row = np.full(len(signal), -1, dtype=np.int64)
+    table_row[entry_days] = np.arange(len(entry_days))
+    price_table = _put_price_table(spy, vix, entry_days, strike_pct, option_expiry_days, risk_free_rate)
+    
+    # Simulate the strategy
+    (
+        has_active_option, option_start_idx, option_expiry_idx, strike_price,
+        option_price, option_cost, option_balance, cash_balance, exit_code,
+        option_entries
+    ) = _simulate_option_strategy(
+        signal,
+        prob,
+        spy,
+        price_table,
+        table_row,
+        threshold,
+        strike_pct,
+        option_expiry_days,
+        option_coverage
+    )
+    
+    # Build the strategy DataFrame once from the input and simulated columns
+    strategy = pd.DataFrame({
+        'date': model_probs.index,
+        'spy_price': spy,
+        'spy_return': spy_prices.pct_change().to_numpy(),
+        'vix': vix,
+        'prob': prob,
+        'actual_crash': np.asarray(actual_crashes),
+        'signal': signal,
+        'stock_balance': spy,
+        'has_active_option': has_active_option,
+        'option_start_idx': option_start_idx,
+        'option_expiry_idx': option_expiry_idx,
+        'strike_price': strike_price,
+        'option_price': option_price,
+        'option_cost': option_cost,
+        'option_balance': option_balance,
+        'cash_balance': cash_balance, # cash to track option PNL, given no stock trade
+        'exit_type': pd.Categorical.from_codes(exit_code, categories=_EXIT_TYPES),  # "expiry", "threshold_exit", "still_active"
+    }, index=model_probs.index)
     
     # Calculate strategy returns
-    initial_balance = strategy.iloc[0]['stock_balance']
+    initial_balance = strategy['stock_balance'].iloc[0]
     
-    for i in range(len(strategy)):
-        strategy.iloc[i, strategy.columns.get_loc('strategy_balance')] = strategy.iloc[i]['stock_balance'] + strategy.iloc[i]['option_balance'] + strategy.iloc[i]['cash_balance']
-        strategy.iloc[i, strategy.columns.get_loc('cum_strategy_dollar_return')] = strategy.iloc[i]['strategy_balance'] - initial_balance
-        strategy.iloc[i, strategy.columns.get_loc('cum_strategy_return')] = strategy.iloc[i]['cum_strategy_dollar_return'] / initial_balance
-        if i > 0:
-            strategy.iloc[i, strategy.columns.get_loc('strategy_return')] = strategy.iloc[i]['strategy_balance'] / strategy.iloc[i - 1]['strategy_balance'] - 1
+    strategy['strategy_balance'] = strategy['stock_balance'] + strategy['option_balance'] + strategy['cash_balance']
+    strategy['strategy_return'] = strategy['strategy_balance'] / strategy['strategy_balance'].shift(1) - 1
+    strategy.loc[strategy.index[0], 'strategy_return'] = 0.0
+    strategy['cum_strategy_dollar_return'] = strategy['strategy_balance'] - initial_balance
+    strategy['cum_strategy_return'] = strategy['cum_strategy_dollar_return'] / initial_balance
     
     strategy['benchmark_balance'] = strategy['stock_balance']
-    strategy['cum_benchmark_dollar_return'] = 0
-    strategy['cum_benchmark_return'] = 0
-    strategy['benchmark_return'] = 0
-    for i in range(len(strategy)):
-        strategy.iloc[i, strategy.columns.get_loc('cum_benchmark_dollar_return')] = strategy.iloc[i]['benchmark_balance'] - initial_balance
-        strategy.iloc[i, strategy.columns.get_loc('cum_benchmark_return')] = strategy.iloc[i]['cum_benchmark_dollar_return'] / initial_balance
-        if i > 0:
-            strategy.iloc[i, strategy.columns.get_loc('benchmark_return')] = strategy.iloc[i]['benchmark_balance'] / strategy.iloc[i - 1]['benchmark_balance'] - 1
-    
+    strategy['cum_benchmark_dollar_return'] = strategy['benchmark_balance'] - initial_balance
+    strategy['cum_benchmark_return'] = strategy['cum_benchmark_dollar_return'] / initial_balance
+    strategy['benchmark_return'] = strategy['benchmark_balance'] / strategy['benchmark_balance'].shift(1) - 1
+    strategy.loc[strategy.index[0], 'benchmark_return'] = 0.0
     
     # Calculate drawdowns
-    strategy['strategy_peak'] = strategy['cum_strategy_return'].cummax()
-    strategy['benchmark_peak'] = strategy['cum_benchmark_return'].cummax()
+    cum_strategy_return = strategy['cum_strategy_return'].to_numpy()
+    cum_benchmark_return = strategy['cum_benchmark_return'].to_numpy()
+    # fmax carries the running maximum across NaN periods instead of propagating NaN
+    strategy_peak = np.fmax.accumulate(cum_strategy_return)
+    benchmark_peak = np.fmax.accumulate(cum_benchmark_return)
+    strategy['strategy_peak'] = strategy_peak
+    strategy['benchmark_peak'] = benchmark_peak
     
-    strategy['strategy_drawdown'] = (strategy['cum_strategy_return'] - strategy['strategy_peak'])
-    strategy['benchmark_drawdown'] = (strategy['cum_benchmark_return'] - strategy['benchmark_peak'])
+    strategy['strategy_drawdown'] = cum_strategy_return - strategy_peak
+    strategy['benchmark_drawdown'] = cum_benchmark_return - benchmark_peak
     
     # Calculate drawdown duration
-    strategy['strategy_drawdown_duration'] = 0
-    strategy['benchmark_drawdown_duration'] = 0
-    current_drawdown_duration = 0
-    current_benchmark_drawdown_duration = 0
-    
-    for i in range(1, len(strategy)):
-        if strategy.iloc[i]['strategy_drawdown'] < 0:
-            current_drawdown_duration += 1
-        else:
-            current_drawdown_duration = 0
-        if strategy.iloc[i]['benchmark_drawdown'] < 0:
-            current_benchmark_drawdown_duration += 1
-        else:
-            current_benchmark_drawdown_duration = 0
-            
-        strategy.iloc[i, strategy.columns.get_loc('strategy_drawdown_duration')] = current_drawdown_duration
-        strategy.iloc[i, strategy.columns.get_loc('benchmark_drawdown_duration')] = current_benchmark_drawdown_duration
+    strategy['strategy_drawdown_duration'] = _drawdown_duration(strategy['strategy_drawdown'])
+    strategy['benchmark_drawdown_duration'] = _drawdown_duration(strategy['benchmark_drawdown'])
     
     # Calculate performance metrics
     total_periods = len(strategy)
     option_periods = strategy[strategy['has_active_option']].shape[0]
-    option_entries = len(strategy[strategy['option_start_idx'] == range(len(strategy))])
     option_pct = option_periods / total_periods
     
     # Count exit types
-    expiry_exits = len(strategy[strategy['exit_type'] == "expiry"])
-    threshold_exits = len(strategy[strategy['exit_type'] == "threshold_exit"])
-    still_active = len(strategy[strategy['exit_type'] == "still_active"])
+    exit_counts = np.bincount(exit_code, minlength=len(_EXIT_TYPES))
+    expiry_exits = exit_counts[_EXIT_EXPIRY]
+    threshold_exits = exit_counts[_EXIT_THRESHOLD]
+    still_active = exit_counts[_EXIT_STILL_ACTIVE]
     
     strategy_return = strategy['cum_strategy_return'].iloc[-1]
     benchmark_return = strategy['cum_benchmark_return'].iloc[-1]
@@ -288,26 +348,18 @@ def backtest_option_strategy(model_probs, actual_crashes, spy_prices, vix_values
     
     # Highlight periods when options were active
     option_periods = strategy[strategy['has_active_option']]
-    option_starts = strategy[strategy['option_start_idx'] >= 0]
+    dates = strategy['date'].to_numpy()
+    last_idx = len(strategy) - 1
+    held = option_start_idx >= 0
     
-    for i in range(len(option_starts)):
-        start_idx = option_starts.iloc[i]['option_start_idx']
-        end_idx = option_starts.iloc[i]['option_expiry_idx']
-        if end_idx >= len(strategy):
-            end_idx = len(strategy) - 1
-            
-        start_date = strategy.iloc[int(start_idx)]['date']
+    for start_idx, end_idx in zip(option_start_idx[held], option_expiry_idx[held]):
+        end_idx = min(end_idx, last_idx)
         
         # Find actual end date (might be earlier than expiry due to threshold exit)
-        actual_end_idx = end_idx
-        for j in range(int(start_idx), int(end_idx) + 1):
-            if strategy.iloc[j]['exit_type'] in ["expiry", "threshold_exit"]:
-                actual_end_idx = j
-                break
-                
-        end_date = strategy.iloc[int(actual_end_idx)]['date']
+        exits = np.flatnonzero(exit_code[start_idx:end_idx + 1])
+        actual_end_idx = start_idx + exits[0] if len(exits) else end_idx
         
-        plt.axvspan(start_date, end_date, color='lightgreen', alpha=0.5)
+        plt.axvspan(dates[start_idx], dates[actual_end_idx], color='lightgreen', alpha=0.5)
     
     # Mark crash events
     crash_dates = strategy[strategy['actual_crash'] == 1].date
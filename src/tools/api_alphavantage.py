@@ -1,15 +1,179 @@
 import os
 import logging
 import requests
+import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
+import gzip
+import json
+import time
+import hashlib
+import tempfile
+import threading
 import argparse
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional; it decodes the multi-MB news payloads several times faster than json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+REQUEST_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+MAX_CONCURRENT_REQUESTS = 8
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB file buffer for CSV output
+
+# Retries of throttled (429) and transient server-error responses, each paced by the rate limiter
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled on every retry
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# One pooled session for all Alpha Vantage calls so the TCP/TLS connection is reused.
+# The adapter only retries failed connects, which never reach the API; anything that
+# may count against the quota is retried in _fetch_json through the rate limiter.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_CONCURRENT_REQUESTS,
+    max_retries=Retry(total=MAX_RETRIES, read=0, status=0, backoff_factor=RETRY_BACKOFF)
+))
+
+# On-disk response cache, one JSON file per (function, parameters)
+CACHE_DIR = os.path.join(".cache", "alphavantage")
+CACHE_TTLS = {
+    'NEWS_SENTIMENT': 60 * 60,        # news keeps arriving; refresh hourly
+    'TIME_SERIES_DAILY': 24 * 60 * 60,  # one new bar per trading day
+}
+TTL_OVERRIDES: Dict[str, int] = {}
+
+# Alpha Vantage reports errors and throttling with HTTP 200 and one of these keys
+_ERROR_KEYS = ('Error Message', 'Note', 'Information')
+
+# Requests per minute allowed per API key by the subscription tier (the free tier allows 5)
+REQUESTS_PER_MINUTE = int(os.getenv('ALPHA_VANTAGE_REQUESTS_PER_MINUTE', '5'))
+
+class AlphaVantageError(requests.exceptions.RequestException):
+    """Alpha Vantage answered with an error or rate-limit message instead of data."""
+
+class _TokenBucket:
+    """Thread-safe token bucket: allows bursts of up to rate_per_min calls, refilled continuously."""
+    
+    def __init__(self, rate_per_min: int):
+        self.capacity = rate_per_min
+        self.tokens = float(rate_per_min)
+        self.refill_per_sec = rate_per_min / 60
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_per_sec)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_per_sec
+            time.sleep(wait)
+
+# One bucket per API key, shared by every fetcher (and thread) using that key
+_rate_limiters: Dict[str, _TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+def _rate_limiter(api_key: str) -> _TokenBucket:
+    """Return the token bucket that paces requests made with api_key."""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(api_key)
+        if limiter is None:
+            limiter = _rate_limiters[api_key] = _TokenBucket(REQUESTS_PER_MINUTE)
+        return limiter
+
+def _cache_path(params: Dict) -> str:
+    """Cache file for a request, keyed by its parameters (without the API key)."""
+    digest = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, params['function'], f"{digest}.json")
+
+def _read_cache(path: str, ttl: int) -> Optional[Dict]:
+    """Return the cached response at path if it is younger than ttl seconds."""
+    try:
+        with open(path, 'rb') as f:
+            entry = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get('fetched_at', 0) > ttl:
+        return None
+    return entry.get('data')
+
+def _write_cache(path: str, data: Dict):
+    """Write a response atomically so concurrent readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': time.time(), 'data': data}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write Alpha Vantage cache {path}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _news_params(tickers: str, time_from: Optional[str], time_to: Optional[str], limit: int) -> Dict:
+    """Query parameters for a NEWS_SENTIMENT call, omitting unset time bounds."""
+    params = {'function': 'NEWS_SENTIMENT', 'tickers': tickers, 'limit': limit}
+    if time_from:
+        params['time_from'] = time_from
+    if time_to:
+        params['time_to'] = time_to
+    return params
+
+def _fetch_json(params: Dict, api_key: str, force_refresh: bool = False) -> Dict:
+    """GET an Alpha Vantage query, serving it from the on-disk cache while fresh.
+    
+    params are the query parameters without the API key; they also key the cache.
+    requests handles the URL encoding, so tickers like BRK.B are sent safely.
+    Throttled and server-error responses are retried up to MAX_RETRIES times,
+    taking a token from api_key's rate limiter before every attempt.
+    Raises requests.exceptions.RequestException if the request fails, including
+    AlphaVantageError when the API returns an error or rate-limit message.
+    """
+    function = params['function']
+    path = _cache_path(params)
+    if not force_refresh:
+        cached = _read_cache(path, TTL_OVERRIDES.get(function, CACHE_TTLS[function]))
+        if cached is not None:
+            return cached
+    
+    limiter = _rate_limiter(api_key)
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        response = _session.get(ALPHA_VANTAGE_URL, params={**params, 'apikey': api_key}, timeout=REQUEST_TIMEOUT)
+        if response.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    response.raise_for_status()
+    try:
+        data = _loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response)
+    # Surface error and rate-limit payloads as failures so they are never cached
+    for key in _ERROR_KEYS:
+        if key in data:
+            raise AlphaVantageError(f"{key}: {data[key]}", response=response)
+    _write_cache(path, data)
+    return data
+
 def get_news_sentiment(ticker: str, time_from: Optional[str] = None, 
-                      time_to: Optional[str] = None, limit: int = 5) -> Optional[Dict]:
+                      time_to: Optional[str] = None, limit: int = 5,
+                      force_refresh: bool = False) -> Optional[Dict]:
     """Fetch news sentiment data for a ticker from Alpha Vantage API.
     
     Args:
@@ -17,6 +181,7 @@ def get_news_sentiment(ticker: str, time_from: Optional[str] = None,
         time_from: Start time in YYYYMMDDTHHMM format (optional)
         time_to: End time in YYYYMMDDTHHMM format (optional)
         limit: Maximum number of results (default 50, max 1000)
+        force_refresh: Bypass the on-disk response cache
     
     Returns:
         Dictionary containing news sentiment data or None if request fails
@@ -26,37 +191,102 @@ def get_news_sentiment(ticker: str, time_from: Optional[str] = None,
         logger.error("ALPHA_VANTAGE_API_KEY_NEWS environment variable not set")
         return None
 
-    url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={ticker}&limit={limit}&apikey={api_key}"
-    
-    if time_from:
-        url += f"&time_from={time_from}"
-    if time_to:
-        url += f"&time_to={time_to}"
-    
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        
-        return data
+        return _fetch_json(_news_params(ticker, time_from, time_to, limit), api_key, force_refresh)
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch news sentiment for {ticker}: {str(e)}")
         return None
 
-def save_news_to_csv(data: Dict, ticker: str):
+def _split_timestamp(time_str: str) -> Tuple[str, str]:
+    """Convert API time format (YYYYMMDDTHHMM[SS]) to readable timestamp and date.
+    
+    The format is fixed-width, so slicing replaces strptime. Anything else is
+    returned unchanged with an empty date.
+    """
+    if isinstance(time_str, str) and len(time_str) in (13, 15) and time_str[8] == 'T' and time_str[:8].isdigit():
+        date = f"{time_str[:4]}-{time_str[4:6]}-{time_str[6:8]}"
+        return f"{date} {time_str[9:11]}:{time_str[11:13]}", date
+    return time_str, ''
+
+def _open_csv(filename: str, compress: bool, mode: str = 'w'):
+    """Open a CSV file for writing, gzip-compressed (with a .gz suffix) if requested.
+    
+    Use mode='a' to append; appending to a .gz file adds a new gzip member, which
+    gzip readers (including pandas) read back as one stream.
+    """
+    if compress:
+        # Level 1 keeps most of the size reduction at a fraction of the CPU cost
+        return gzip.open(filename + '.gz', mode + 't', compresslevel=1, encoding='utf-8', newline='')
+    return open(filename, mode, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+
+def _saved_urls(path: str, compress: bool) -> set:
+    """Article URLs already written to a news CSV (plain or gzip-compressed)."""
+    opener = gzip.open if compress else open
+    with opener(path, 'rt', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or 'url' not in header:
+            return set()
+        column = header.index('url')
+        return {row[column] for row in reader if len(row) > column}
+
+def _news_rows(feed: List[Dict], ticker: str) -> Iterator[Tuple]:
+    """Yield CSV rows (in save_news_to_csv fieldnames order) for one ticker from a news feed."""
+    for item in feed:
+        # Parse the publish time once per article
+        time_published, date = _split_timestamp(item.get('time_published', ''))
+        
+        # Most articles list a single author; skip the join for those
+        authors = item.get('authors') or ()
+        author = authors[0] if len(authors) == 1 else "; ".join(authors)
+        
+        # Article columns shared by every row written for this article
+        article = (
+            item.get('title', ''),
+            item.get('url', ''),
+            time_published,
+            date,
+            item.get('source', ''),
+            author,
+            item.get('summary', ''),
+        )
+        overall_label = item.get('overall_sentiment_label', '')
+        
+        # Process each ticker sentiment in the article
+        ticker_sentiments = item.get('ticker_sentiment', [])
+        if not ticker_sentiments:  # If no ticker sentiments, include with empty values
+            yield (ticker,) + article + (item.get('overall_sentiment_score', 0), overall_label, 0, 0, '')
+        else:
+            overall_score = float(item.get('overall_sentiment_score', 0))
+            for ticker_sent in ticker_sentiments:
+                if ticker_sent['ticker'] == ticker:
+                    yield (ticker_sent['ticker'],) + article + (
+                        overall_score,
+                        overall_label,
+                        float(ticker_sent.get('ticker_sentiment_score', '0')),
+                        float(ticker_sent.get('relevance_score', '0')),
+                        ticker_sent.get('ticker_sentiment_label', ''),
+                    )
+
+def save_news_to_csv(data: Dict, ticker: str, compress: bool = False):
     """Save sentiment data to CSV file in logs directory with expanded fields.
     
     Args:
         data: Sentiment data dictionary from API
         ticker: Ticker symbol processed
+        compress: Write a gzip-compressed .csv.gz file instead
     
     CSV Format:
+    - One file per ticker per day; later calls on the same day append to it,
+      skipping articles whose URL is already in the file
     - One row per article-ticker combination
     - Includes article metadata, overall sentiment, ticker sentiment, and topics
     """
     os.makedirs("logs", exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"logs/news_sentiment_{ticker}_{timestamp}.csv"
+    filename = f"logs/news_sentiment_{ticker}_{datetime.now():%Y%m%d}.csv"
+    # Only a new (or empty) file gets the header row
+    path = filename + '.gz' if compress else filename
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
     
     fieldnames = [
         'ticker', 'title', 'url', 'time_published', 'date', 'source',
@@ -65,63 +295,26 @@ def save_news_to_csv(data: Dict, ticker: str):
         'ticker_relevance_score', 'sentiment'
     ]
     
-    def format_time(time_str: str) -> str:
-        """Convert API time format (YYYYMMDDTHHMM) to readable format"""
-        try:
-            dt = datetime.strptime(time_str, "%Y%m%dT%H%M")
-            return dt.strftime("%Y-%m-%d %H:%M")
-        except (ValueError, TypeError):
-            return time_str
-    
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    with _open_csv(filename, compress, 'a') as csvfile:
+        writer = csv.writer(csvfile)
+        if write_header:
+            writer.writerow(fieldnames)
         
-        if data and 'feed' in data:
-            for item in data['feed']:
-                # Process each ticker sentiment in the article
-                ticker_sentiments = item.get('ticker_sentiment', [])
-                if not ticker_sentiments:  # If no ticker sentiments, include with empty values
-                    writer.writerow({
-                        'ticker': ticker,
-                        'title': item.get('title', ''),
-                        'url': item.get('url', ''),
-                        'time_published': format_time(item.get('time_published', '')),
-                        'date': datetime.strptime(item.get('time_published', ''), "%Y%m%dT%H%M").strftime("%Y-%m-%d") if item.get('time_published') else '',
-                        'source': item.get('source', ''),
-                        'author': "; ".join(item.get('authors', [])),
-                        'summary': item.get('summary', ''),
-                        'overall_sentiment_score': item.get('overall_sentiment_score', 0),
-                        'overall_sentiment_label': item.get('overall_sentiment_label', ''),
-                        'ticker_sentiment_score': 0,
-                        'ticker_relevance_score': 0,
-                        'sentiment': '',
-                    })
-                else:
-                    for ticker_sent in ticker_sentiments:
-                        if ticker_sent['ticker'] == ticker:
-                            writer.writerow({
-                                'ticker': ticker_sent['ticker'],
-                                'title': item.get('title', ''),
-                                'url': item.get('url', ''),
-                                'time_published': format_time(item.get('time_published', '')),
-                                'date': datetime.strptime(item.get('time_published', ''), "%Y%m%dT%H%M").strftime("%Y-%m-%d") if item.get('time_published') else '',
-                                'source': item.get('source', ''),
-                                'author': "; ".join(item.get('authors', [])),
-                                'summary': item.get('summary', ''),
-                                'overall_sentiment_score': float(item.get('overall_sentiment_score', 0)),
-                                'overall_sentiment_label': item.get('overall_sentiment_label', ''),
-                                'ticker_sentiment_score': float(ticker_sent.get('ticker_sentiment_score', '0')),
-                                'ticker_relevance_score': float(ticker_sent.get('relevance_score', '0')),
-                                'sentiment': ticker_sent.get('ticker_sentiment_label', ''),
-                            })
-
-def get_daily_prices(ticker: str, outputsize: str = 'compact') -> Optional[Dict]:
+        feed = data.get('feed') if data else None
+        if feed and not write_header:
+            # Repeated calls (e.g. served from the response cache) return the same articles
+            saved = _saved_urls(path, compress)
+            feed = [item for item in feed if not item.get('url') or item['url'] not in saved]
+        if feed:
+            writer.writerows(_news_rows(feed, ticker))
+
+def get_daily_prices(ticker: str, outputsize: str = 'compact', force_refresh: bool = False) -> Optional[Dict]:
     """Fetch daily price data for a ticker from Alpha Vantage API.
     
     Args:
         ticker: Stock ticker symbol (e.g. 'AAPL')
         outputsize: 'compact' (latest 100 points) or 'full' (20+ years history)
+        force_refresh: Bypass the on-disk response cache
     
     Returns:
         Dictionary containing price data or None if request fails
@@ -135,91 +328,91 @@ def get_daily_prices(ticker: str, outputsize: str = 'compact') -> Optional[Dict]
         logger.error("outputsize must be either 'compact' or 'full'")
         return None
 
-    url = f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={ticker}&outputsize={outputsize}&apikey={api_key}"
+    params = {'function': 'TIME_SERIES_DAILY', 'symbol': ticker, 'outputsize': outputsize}
     
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return _fetch_json(params, api_key, force_refresh)
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch prices for {ticker}: {str(e)}")
         return None
 
-def save_prices_to_csv(data: Dict, ticker: str):
+# Alpha Vantage daily bar keys and the CSV column each one is written to
+_PRICE_FIELDS = {'1. open': 'open', '2. high': 'high', '3. low': 'low', '4. close': 'close', '5. volume': 'volume'}
+
+def save_prices_to_csv(data: Dict, ticker: str, compress: bool = False):
     """Save price data to CSV file in logs directory.
     
     Args:
         data: Dictionary containing price data
         ticker: Ticker symbol processed
+        compress: Write a gzip-compressed .csv.gz file instead
     """
     os.makedirs("logs", exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"logs/daily_prices_{ticker}_{timestamp}.csv"
     
-    fieldnames = ['date', 'open', 'high', 'low', 'close', 'volume']
+    series = data.get('Time Series (Daily)', {}) if data else {}
     
-    with open(filename, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        if data and 'Time Series (Daily)' in data:
-            for date, prices in data['Time Series (Daily)'].items():
-                writer.writerow({
-                    'date': date,
-                    'open': prices['1. open'],
-                    'high': prices['2. high'],
-                    'low': prices['3. low'],
-                    'close': prices['4. close'],
-                    'volume': prices['5. volume']
-                })
-
-def get_news_sentiment_multi(tickers: list[str], time_from: Optional[str] = None, time_to: Optional[str] = None, limit: int = 1000) -> dict:
+    # Build the whole table at once and let pandas write it in C
+    prices = pd.DataFrame.from_dict(series, orient='index').reindex(columns=list(_PRICE_FIELDS))
+    prices.columns = list(_PRICE_FIELDS.values())
+    prices.index.name = 'date'
+    
+    with _open_csv(filename, compress) as csvfile:
+        prices.to_csv(csvfile, lineterminator='\r\n')
+
+def _fetch_news_batch(batch: List[str], api_key: str, time_from: Optional[str], time_to: Optional[str], limit: int, force_refresh: bool) -> Dict[str, Optional[Dict]]:
+    """Fetch one NEWS_SENTIMENT call for a batch of tickers and split the feed per ticker."""
+    results = {}
+    try:
+        data = _fetch_json(_news_params(",".join(batch), time_from, time_to, limit), api_key, force_refresh)
+        # Alpha Vantage returns all news in one 'feed', so split by ticker in a single pass
+        feed = data.get('feed') if data else None
+        if feed is not None:
+            ticker_feeds = {ticker: [] for ticker in batch}
+            for item in feed:
+                matched = set()
+                for ts in item.get('ticker_sentiment', []):
+                    ticker = ts.get('ticker')
+                    if ticker in ticker_feeds and ticker not in matched:
+                        matched.add(ticker)
+                        ticker_feeds[ticker].append(item)
+            for ticker, ticker_feed in ticker_feeds.items():
+                results[ticker] = {'feed': ticker_feed}
+        else:
+            logger.warning(f"No news feed in Alpha Vantage response for {batch}")
+            for ticker in batch:
+                results[ticker] = None
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to fetch news sentiment for {batch}: {str(e)}")
+        for ticker in batch:
+            results[ticker] = None
+    return results
+
+def get_news_sentiment_multi(tickers: list[str], time_from: Optional[str] = None, time_to: Optional[str] = None, limit: int = 1000, force_refresh: bool = False) -> dict:
     """
     Fetch news sentiment data for a list of tickers from Alpha Vantage API.
     Returns a dict mapping ticker to its news sentiment data (or None if failed).
+    Batches are requested concurrently, up to MAX_CONCURRENT_REQUESTS at a time.
+    Responses are cached on disk; pass force_refresh=True to bypass the cache.
     """
     results = {}
     if not tickers:
         return results
     
-    # Alpha Vantage supports comma-separated tickers, but may limit results per call
     api_key = os.getenv('ALPHA_VANTAGE_API_KEY_NEWS')
     if not api_key:
         logger.error("ALPHA_VANTAGE_API_KEY_NEWS environment variable not set")
         return {t: None for t in tickers}
 
-    # Alpha Vantage allows up to 100 tickers per call, but limit to 5-10 for safety
+    # Keep one ticker per call: a comma-separated tickers filter only returns articles
+    # mentioning every listed ticker, and all tickers would share one `limit`
     batch_size = 1
-    for i in range(0, len(tickers), batch_size):
-        batch = tickers[i:i+batch_size]
-        tickers_str = ",".join(batch)
-        url = f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT&tickers={tickers_str}&limit={limit}&apikey={api_key}"
-        if time_from:
-            url += f"&time_from={time_from}"
-        if time_to:
-            url += f"&time_to={time_to}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            # Alpha Vantage returns all news in one 'feed', so split by ticker
-            if data and 'feed' in data:
-                for ticker in batch:
-                    # Filter feed for this ticker
-                    ticker_feed = []
-                    for item in data['feed']:
-                        for ts in item.get('ticker_sentiment', []):
-                            if ts.get('ticker') == ticker:
-                                ticker_feed.append(item)
-                                break
-                    results[ticker] = {'feed': ticker_feed}
-            else:
-                for ticker in batch:
-                    results[ticker] = None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch news sentiment for {batch}: {str(e)}")
-            print(f"Failed to fetch news sentiment for {batch}: {str(e)}")
-            for ticker in batch:
-                results[ticker] = None
+    unique_tickers = list(dict.fromkeys(tickers))  # Fetch repeated tickers once, keeping order
+    batches = [unique_tickers[i:i+batch_size] for i in range(0, len(unique_tickers), batch_size)]
+    
+    # The calls are I/O bound, so overlap them on threads sharing the pooled session
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(batches))) as pool:
+        for batch_results in pool.map(lambda batch: _fetch_news_batch(batch, api_key, time_from, time_to, limit, force_refresh), batches):
+            results.update(batch_results)
     return results
-
@@ -4,11 +4,21 @@ These functions can be used as replacements or fallbacks for the original API fu
 """
 
 import os
+import io
+import csv
 import datetime
 import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 import psycopg2
 import pandas as pd
 from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from src.data.models import CompanyFacts, Price, FinancialMetrics, LineItem, InsiderTrade, CompanyNews
 from dotenv import load_dotenv
 from colorama import Fore, Style
@@ -16,8 +26,8 @@ from colorama import Fore, Style
 # Load environment variables
 load_dotenv()
 
-def get_db_connection():
-    """Get a connection to the database."""
+def _connection_string() -> str:
+    """Build the database connection string from environment variables."""
     # Get database connection parameters from environment variables
     db_user = os.environ.get("DB_USER", "")
     db_password = os.environ.get("DB_PASSWORD", "")
@@ -29,27 +39,215 @@ def get_db_connection():
     connection_string = f"postgresql://{db_user}:{db_password}@{db_host}/{db_name}?sslmode={db_sslmode}"
     
     # Fallback to direct connection string if provided (for backward compatibility)
-    connection_string = os.environ.get("DATABASE_URL", connection_string)
+    return os.environ.get("DATABASE_URL", connection_string)
+
+def get_db_connection():
+    """Get a new, unpooled connection to the database."""
+    return psycopg2.connect(_connection_string())
+
+# Connection pool shared by the helpers below, created on first use so importing
+# this module never touches the database
+DB_POOL_MIN_CONN = 2
+DB_POOL_MAX_CONN = 16
+_pool = None
+_pool_lock = threading.Lock()
+
+class _PooledConnection(psycopg2.extensions.connection):
+    """
+    Connection that remembers which server-side prepared statements it holds.
     
-    return psycopg2.connect(connection_string)
+    A PREPARE issued in a transaction that rolls back is dropped by the server, so new
+    names stay in pending_prepared until db_cursor commits the transaction.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        self.pending_prepared = set()
 
-def get_company_facts_db(ticker: str) -> CompanyFacts | None:
-    """Fetch company facts from the PostgreSQL database."""
+def _settle_prepared(conn, committed: bool):
+    """Keep the statements prepared in the transaction that just ended if it committed."""
+    pending = getattr(conn, 'pending_prepared', None)
+    if pending:
+        if committed:
+            conn.prepared |= pending
+        pending.clear()
+
+def get_pool() -> ThreadedConnectionPool:
+    """Return the shared connection pool, creating it on first call."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    DB_POOL_MIN_CONN, DB_POOL_MAX_CONN,
+                    dsn=_connection_string(), connection_factory=_PooledConnection
+                )
+    return _pool
+
+# Reads NUMERIC columns as float rather than Decimal
+_NUMERIC_AS_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, "NUMERIC_AS_FLOAT",
+    lambda value, cursor: float(value) if value is not None else None
+)
+
+@contextmanager
+def db_cursor(dict_cursor: bool = False, numeric_as_float: bool = False, async_commit: bool = False):
+    """
+    Borrow a pooled connection and yield a cursor on it.
+    
+    The transaction is committed when the block exits normally and rolled back if it
+    raises; either way the connection goes back to the pool.
+    
+    Args:
+        dict_cursor: Return rows as dictionaries (RealDictCursor)
+        numeric_as_float: Return NUMERIC columns as float instead of Decimal
+        async_commit: Commit without waiting for the WAL flush (synchronous_commit = off).
+            A crash can lose the last few commits but never corrupts data, so only use
+            this for data that can be fetched again from its upstream API.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Query the database
-        cursor.execute("SELECT * FROM company_facts WHERE ticker = %s", (ticker,))
-        result = cursor.fetchone()
+        with conn.cursor(cursor_factory=RealDictCursor if dict_cursor else None) as cursor:
+            if numeric_as_float:
+                psycopg2.extensions.register_type(_NUMERIC_AS_FLOAT, cursor)
+            if async_commit:
+                # Scoped to this transaction; the pooled connection keeps its default
+                cursor.execute("SET LOCAL synchronous_commit = off")
+            yield cursor
+        conn.commit()
+        _settle_prepared(conn, committed=True)
+    except BaseException:
+        if not conn.closed:
+            conn.rollback()
+        _settle_prepared(conn, committed=False)
+        raise
+    finally:
+        # Drop connections that died mid-use instead of handing them out again
+        pool.putconn(conn, close=bool(conn.closed))
+
+# Columns the getters select: exactly what their models consume
+PRICE_COLS = 'ticker, time, biz_date, open, close, high, low, volume'
+FINANCIAL_METRICS_COLS = ', '.join(FinancialMetrics.model_fields)
+INSIDER_TRADE_COLS = ', '.join(InsiderTrade.model_fields)
+COMPANY_NEWS_COLS = ', '.join(CompanyNews.model_fields)
+
+# Hot, fixed-shape lookups prepared once per pooled connection so the server
+# skips parsing and planning them on every call
+_PREPARED_STATEMENTS = {
+    'get_market_cap': "SELECT market_cap FROM company_facts WHERE ticker = $1",
+    'get_prices': f"SELECT {PRICE_COLS} FROM prices WHERE ticker = $1 AND biz_date >= $2 AND biz_date <= $3 ORDER BY time DESC",
+    'get_financial_metrics': f"SELECT {FINANCIAL_METRICS_COLS} FROM financial_metrics WHERE ticker = $1 AND report_period <= $2 AND period = $3 ORDER BY report_period DESC LIMIT $4",
+}
+
+def _execute_prepared(cursor, name: str, params: tuple):
+    """Execute one of _PREPARED_STATEMENTS, preparing it first if this connection has not yet."""
+    conn = cursor.connection
+    if name not in conn.prepared and name not in conn.pending_prepared:
+        cursor.execute(f"PREPARE {name} AS {_PREPARED_STATEMENTS[name]}")
+        conn.pending_prepared.add(name)
+    cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+# Rows read back from our own tables are trusted, so models are built from them
+# without validation. Set VALIDATE_DB_ROWS=1 to validate (e.g. after a schema change).
+VALIDATE_DB_ROWS = os.environ.get("VALIDATE_DB_ROWS", "0") == "1"
+
+def _db_model(model, row: dict):
+    """Build a model from a database row, validating only if VALIDATE_DB_ROWS is set."""
+    return model(**row) if VALIDATE_DB_ROWS else model.model_construct(**row)
+
+def get_for_tickers(getter, tickers: list[str], *args, **kwargs) -> dict:
+    """
+    Run a per-ticker getter for several tickers concurrently.
+    
+    Each call borrows its own pooled connection, so the lookups overlap instead of
+    running back to back.
+    
+    Args:
+        getter: One of the *_db getters taking the ticker as its first argument
+        tickers: Ticker symbols to fetch
+        *args, **kwargs: Remaining arguments passed to every getter call
         
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+    Returns:
+        A dict mapping each ticker to the getter's result
+    """
+    unique_tickers = list(dict.fromkeys(tickers))
+    if not unique_tickers:
+        return {}
+    
+    # Never use more workers than the pool has connections
+    with ThreadPoolExecutor(max_workers=min(len(unique_tickers), DB_POOL_MAX_CONN)) as executor:
+        results = executor.map(lambda ticker: getter(ticker, *args, **kwargs), unique_tickers)
+        return dict(zip(unique_tickers, results))
+
+@lru_cache(maxsize=None)
+def _upsert_sql(table: str, fields: tuple[str, ...], conflict_fields: tuple[str, ...], single_row: bool = False) -> str:
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement, once per (table, column set).
+    
+    Args:
+        table: Table to insert into
+        fields: Columns to insert; every non-conflict column is updated on conflict
+        conflict_fields: Columns of the unique constraint to upsert on
+        single_row: Use one row of %s placeholders for cursor.execute instead of the
+            single VALUES %s that execute_values expects
+    """
+    values = f"({', '.join(['%s'] * len(fields))})" if single_row else "%s"
+    update_fields = ', '.join([f"{field} = EXCLUDED.{field}" for field in fields if field not in conflict_fields])
+    update_fields += ", updated_at = CURRENT_TIMESTAMP"
+    
+    return f"""
+    INSERT INTO {table} ({', '.join(fields)})
+    VALUES {values}
+    ON CONFLICT ({', '.join(conflict_fields)}) DO UPDATE SET {update_fields}
+    """
+
+def _group_by_ticker(results: list[dict], tickers: list[str], convert) -> dict:
+    """Split rows ordered by ticker into {ticker: converted rows}, with None for tickers without rows."""
+    grouped = dict.fromkeys(tickers)
+    for ticker, rows in groupby(results, key=itemgetter('ticker')):
+        grouped[ticker] = convert(list(rows))
+    return grouped
+
+# Company facts change rarely, so lookups (including misses) are kept in memory for
+# COMPANY_FACTS_CACHE_TTL seconds. Entries map (kind, ticker) -> (expires_at, value).
+COMPANY_FACTS_CACHE_TTL = 3600
+_company_facts_cache: dict[tuple[str, str], tuple[float, object]] = {}
+
+def _get_cached(kind: str, ticker: str) -> tuple[bool, object]:
+    """Return (hit, value) for a cached company facts lookup."""
+    entry = _company_facts_cache.get((kind, ticker))
+    if entry is not None and entry[0] > time.monotonic():
+        return True, entry[1]
+    return False, None
+
+def _set_cached(kind: str, ticker: str, value):
+    """Cache a company facts lookup for COMPANY_FACTS_CACHE_TTL seconds."""
+    _company_facts_cache[(kind, ticker)] = (time.monotonic() + COMPANY_FACTS_CACHE_TTL, value)
+
+def invalidate_cache(ticker: str | None = None):
+    """Drop cached company facts and market cap for a ticker, or for every ticker if None."""
+    if ticker is None:
+        _company_facts_cache.clear()
+        return
+    for kind in ('company_facts', 'market_cap'):
+        _company_facts_cache.pop((kind, ticker), None)
+
+def get_company_facts_db(ticker: str) -> CompanyFacts | None:
+    """Fetch company facts from the PostgreSQL database (cached in memory, see COMPANY_FACTS_CACHE_TTL)."""
+    hit, facts = _get_cached('company_facts', ticker)
+    if hit:
+        return facts
+    
+    try:
+        with db_cursor(dict_cursor=True) as cursor:
+            # Query the database
+            cursor.execute("SELECT * FROM company_facts WHERE ticker = %s", (ticker,))
+            result = cursor.fetchone()
         
         # Return None if no data found
         if not result:
+            _set_cached('company_facts', ticker, None)
             return None
         
         # Convert date strings to the format expected by the model
@@ -57,77 +255,58 @@ def get_company_facts_db(ticker: str) -> CompanyFacts | None:
             result['listing_date'] = result['listing_date'].isoformat()
             
         # Convert the result to a CompanyFacts object
-        return CompanyFacts(**result)
+        facts = CompanyFacts(**result)
+        _set_cached('company_facts', ticker, facts)
+        return facts
         
     except Exception as e:
         print(f"Error fetching company facts from database: {e}")
         return None
 
 def get_market_cap_db(ticker: str) -> float | None:
-    """Fetch market cap from the PostgreSQL database."""
+    """Fetch market cap from the PostgreSQL database (cached in memory, see COMPANY_FACTS_CACHE_TTL)."""
+    hit, market_cap = _get_cached('market_cap', ticker)
+    if hit:
+        return market_cap
+    
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Query the database
-        cursor.execute("SELECT market_cap FROM company_facts WHERE ticker = %s", (ticker,))
-        result = cursor.fetchone()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor() as cursor:
+            # Query the database
+            _execute_prepared(cursor, 'get_market_cap', (ticker,))
+            result = cursor.fetchone()
         
-        # Return None if no data found
-        if not result:
-            return None
-        
-        return result[0]
+        # None if no data found
+        market_cap = result[0] if result else None
+        _set_cached('market_cap', ticker, market_cap)
+        return market_cap
         
     except Exception as e:
         print(f"Error fetching market cap from database: {e}")
         return None
 
+# Fields to insert/update
+_COMPANY_FACTS_FIELDS = (
+    'ticker', 'name', 'cik', 'industry', 'sector', 'category', 
+    'exchange', 'is_active', 'listing_date', 'location', 'market_cap',
+    'number_of_employees', 'sec_filings_url', 'sic_code', 
+    'sic_industry', 'sic_sector', 'website_url', 'weighted_average_shares'
+)
+
 def save_company_facts(company_facts: CompanyFacts) -> bool:
     """Save company facts to the PostgreSQL database."""
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Prepare data for insert/update
         data = company_facts.model_dump()
         
-        # Fields to insert/update
-        fields = [
-            'ticker', 'name', 'cik', 'industry', 'sector', 'category', 
-            'exchange', 'is_active', 'listing_date', 'location', 'market_cap',
-            'number_of_employees', 'sec_filings_url', 'sic_code', 
-            'sic_industry', 'sic_sector', 'website_url', 'weighted_average_shares'
-        ]
-        
-        # Build the SQL query
-        placeholders = ', '.join(['%s'] * len(fields))
-        field_list = ', '.join(fields)
-        update_list = ', '.join([f"{field} = EXCLUDED.{field}" for field in fields])
-        update_list += ", updated_at = CURRENT_TIMESTAMP"
-        
-        sql = f"""
-        INSERT INTO company_facts ({field_list})
-        VALUES ({placeholders})
-        ON CONFLICT (ticker) DO UPDATE SET {update_list}
-        """
-        
-        # Execute the query
-        cursor.execute(sql, [data.get(field) for field in fields])
-        
-        # Commit the transaction
-        conn.commit()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor() as cursor:
+            # Execute the query
+            cursor.execute(
+                _upsert_sql('company_facts', _COMPANY_FACTS_FIELDS, ('ticker',), single_row=True),
+                [data.get(field) for field in _COMPANY_FACTS_FIELDS]
+            )
         
+        # Later lookups must see the new values
+        invalidate_cache(company_facts.ticker)
         return True
         
     except Exception as e:
@@ -137,109 +316,169 @@ def save_company_facts(company_facts: CompanyFacts) -> bool:
 def get_prices_db(ticker: str, start_date: str, end_date: str) -> list[Price] | None:
     """Fetch price data from the PostgreSQL database for a specific date range."""
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            # Query the database
+            _execute_prepared(cursor, 'get_prices', (ticker, start_date, end_date))
+            results = cursor.fetchall()
+        
+        # Return None if no data found
+        if not results:
+            return None
         
-        # Query the database
-        cursor.execute(
-            "SELECT * FROM prices WHERE ticker = %s AND biz_date >= %s AND biz_date <= %s ORDER BY time DESC", 
-            (ticker, start_date, end_date)
-        )
-        results = cursor.fetchall()
+        return _prices_from_rows(results)
         
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+    except Exception as e:
+        print(f"Error fetching price data from database: {e}")
+        return None
+
+def _prices_from_rows(results: list[dict]) -> list[Price]:
+    """Format dates and convert price rows to Price objects."""
+    return [
+        _db_model(Price, {
+            'ticker': result['ticker'], 
+            'open': result['open'],
+            'close': result['close'],
+            'high': result['high'],
+            'low': result['low'],
+            'volume': result['volume'],
+            'time': result['time'].isoformat(),
+            'biz_date': result['biz_date'].isoformat() if result['biz_date'] else None  
+        })
+        for result in results
+    ]
+
+def get_prices_bulk_db(tickers: list[str], start_date: str, end_date: str) -> dict[str, list[Price] | None]:
+    """
+    Fetch price data for several tickers with a single query.
+    
+    Args:
+        tickers: The stock ticker symbols
+        start_date: The start date for the price data range (YYYY-MM-DD)
+        end_date: The end date for the price data range (YYYY-MM-DD)
+        
+    Returns:
+        A dict mapping each ticker to its prices (as get_prices_db would return them),
+        or None if the query fails
+    """
+    try:
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            cursor.execute(
+                f"SELECT {PRICE_COLS} FROM prices WHERE ticker = ANY(%s) AND biz_date >= %s AND biz_date <= %s ORDER BY ticker, time DESC", 
+                (list(tickers), start_date, end_date)
+            )
+            results = cursor.fetchall()
+        
+        return _group_by_ticker(results, tickers, _prices_from_rows)
+        
+    except Exception as e:
+        print(f"Error fetching price data from database: {e}")
+        return None
+
+def get_prices_df_db(ticker: str, start_date: str, end_date: str) -> pd.DataFrame | None:
+    """
+    Fetch price data for a date range straight into a DataFrame.
+    
+    Rows are streamed out of PostgreSQL with COPY and parsed by pandas, skipping the
+    per-row Price objects that get_prices_db builds. The frame matches
+    price_service.prices_to_df: indexed by Date (from biz_date) and sorted oldest first.
+    
+    Args:
+        ticker: The stock ticker symbol
+        start_date: The start date for the price data range (YYYY-MM-DD)
+        end_date: The end date for the price data range (YYYY-MM-DD)
+        
+    Returns:
+        A DataFrame of prices or None if not found
+    """
+    try:
+        buffer = io.StringIO()
+        with db_cursor() as cursor:
+            # COPY takes no bind parameters, so let psycopg2 quote them into the query
+            query = cursor.mogrify(
+                "SELECT ticker, time, biz_date, open, close, high, low, volume FROM prices WHERE ticker = %s AND biz_date >= %s AND biz_date <= %s ORDER BY biz_date",
+                (ticker, start_date, end_date)
+            ).decode()
+            cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", buffer)
+        
+        buffer.seek(0)
+        df = pd.read_csv(buffer, parse_dates=["time"])
         
         # Return None if no data found
-        if not results:
+        if df.empty:
             return None
         
-        # Format dates and convert to Price objects
-        prices = []
-        for result in results:
-            # Convert datetime to ISO format string
-            result['time'] = result['time'].isoformat()
-            # Create a Price object
-            prices.append(Price(**{
-                'ticker': result['ticker'], 
-                'open': float(result['open']),
-                'close': float(result['close']),
-                'high': float(result['high']),
-                'low': float(result['low']),
-                'volume': int(result['volume']),
-                'time': result['time'],
-                'biz_date': result['biz_date'].isoformat() if result['biz_date'] else None  
-            }))
-        
-        return prices
+        df["Date"] = pd.to_datetime(df["biz_date"])
+        return df.set_index("Date")
         
     except Exception as e:
         print(f"Error fetching price data from database: {e}")
         return None
 
+def _price_biz_date(price: Price) -> datetime.date:
+    """Business date of a price: its biz_date if set, otherwise the date part of its time."""
+    if hasattr(price, 'biz_date') and price.biz_date:
+        biz_date = price.biz_date
+        if isinstance(biz_date, str):
+            # Convert string to date object if needed
+            biz_date = datetime.datetime.strptime(biz_date, '%Y-%m-%d').date()
+        return biz_date
+    # Extract date from time for biz_date (legacy method)
+    return datetime.datetime.fromisoformat(price.time.replace('Z', '+00:00')).date()
+
 def save_prices(ticker: str, prices: list[Price]) -> bool:
-    """Save price data to the PostgreSQL database."""
+    """Save price data to the PostgreSQL database.
+    
+    Rows are streamed into a temporary staging table with COPY and upserted into
+    prices with a single INSERT ... SELECT, so the whole batch costs a few round
+    trips instead of one per price.
+    """
     if not prices:
         return False
         
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert records
-        insert_count = 0
+        # One row per biz_date; a later price for the same date replaces an earlier one
+        rows = {}
         for price in prices:
             try:
-                # Use biz_date from the object if available, otherwise extract from time
-                if hasattr(price, 'biz_date') and price.biz_date:
-                    # Use the provided biz_date
-                    biz_date = price.biz_date
-                    if isinstance(biz_date, str):
-                        # Convert string to date object if needed
-                        biz_date = datetime.datetime.strptime(biz_date, '%Y-%m-%d').date()
-                else:
-                    # Extract date from time for biz_date (legacy method)
-                    time_obj = datetime.datetime.fromisoformat(price.time.replace('Z', '+00:00'))
-                    biz_date = time_obj.date()
-                
-                sql = """
-                INSERT INTO prices (ticker, time, biz_date, open, close, high, low, volume)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (ticker, biz_date) DO UPDATE SET
-                    time = EXCLUDED.time,
-                    open = EXCLUDED.open,
-                    close = EXCLUDED.close,
-                    high = EXCLUDED.high,
-                    low = EXCLUDED.low,
-                    volume = EXCLUDED.volume,
-                    updated_at = CURRENT_TIMESTAMP
-                """
-                
-                cursor.execute(sql, (
-                    ticker,
-                    price.time,
-                    biz_date,
-                    price.open,
-                    price.close,
-                    price.high,
-                    price.low,
-                    price.volume
-                ))
-                insert_count += 1
+                biz_date = _price_biz_date(price)
             except Exception as inner_e:
                 print(f"Error inserting price for {ticker} on {price.time}: {inner_e}")
-        
-        # Commit the transaction
-        conn.commit()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
-        
-        print(f"Successfully saved {insert_count} price records for {ticker}")
+                continue
+            rows[biz_date] = (ticker, price.time, biz_date, price.open, price.close, price.high, price.low, price.volume)
+        
+        if not rows:
+            print(f"Successfully saved 0 price records for {ticker}")
+            return True
+        
+        # Write the batch as CSV in memory for COPY
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows.values())
+        buffer.seek(0)
+        
+        with db_cursor(async_commit=True) as cursor:
+            # Staging table with the same column types as prices, dropped at commit
+            cursor.execute("""
+            CREATE TEMP TABLE prices_stage ON COMMIT DROP AS
+            SELECT ticker, time, biz_date, open, close, high, low, volume FROM prices WITH NO DATA
+            """)
+            cursor.copy_expert(
+                "COPY prices_stage (ticker, time, biz_date, open, close, high, low, volume) FROM STDIN WITH CSV",
+                buffer
+            )
+            cursor.execute("""
+            INSERT INTO prices (ticker, time, biz_date, open, close, high, low, volume)
+            SELECT ticker, time, biz_date, open, close, high, low, volume FROM prices_stage
+            ON CONFLICT (ticker, biz_date) DO UPDATE SET
+                time = EXCLUDED.time,
+                open = EXCLUDED.open,
+                close = EXCLUDED.close,
+                high = EXCLUDED.high,
+                low = EXCLUDED.low,
+                volume = EXCLUDED.volume,
+                updated_at = CURRENT_TIMESTAMP
+            """)
+        
+        print(f"Successfully saved {len(rows)} price records for {ticker}")
         return True
         
     except Exception as e:
@@ -265,42 +504,68 @@ def get_financial_metrics_db(
         A list of FinancialMetrics objects or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Query the database
-        cursor.execute(
-            """
-            SELECT * FROM financial_metrics 
-            WHERE ticker = %s 
-              AND report_period <= %s 
-              AND period = %s 
-            ORDER BY report_period DESC 
-            LIMIT %s
-            """, 
-            (ticker, end_date, period, limit)
-        )
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            # Query the database
+            _execute_prepared(cursor, 'get_financial_metrics', (ticker, end_date, period, limit))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
             return None
         
-        # Convert to FinancialMetrics objects
-        metrics = []
-        for result in results:
-            # Convert dates to string format
-            result['report_period'] = result['report_period'].isoformat()
-            
-            # Create a FinancialMetrics object
-            metrics.append(FinancialMetrics(**result))
+        return _financial_metrics_from_rows(results)
         
-        return metrics
+    except Exception as e:
+        print(f"Error fetching financial metrics from database: {e}")
+        return None
+
+def _financial_metrics_from_rows(results: list[dict]) -> list[FinancialMetrics]:
+    """Format dates and convert financial metrics rows to FinancialMetrics objects."""
+    for result in results:
+        # Convert dates to string format
+        result['report_period'] = result['report_period'].isoformat()
+    
+    return [_db_model(FinancialMetrics, result) for result in results]
+
+def get_financial_metrics_bulk_db(
+    tickers: list[str], 
+    end_date: str, 
+    period: str = "ttm", 
+    limit: int = 10
+) -> dict[str, list[FinancialMetrics] | None]:
+    """
+    Fetch financial metrics for several tickers with a single query.
+    
+    Args:
+        tickers: The stock ticker symbols
+        end_date: The end date for filtering metrics (only metrics with report_period <= end_date)
+        period: The reporting period (e.g., "ttm", "annual", "quarterly")
+        limit: Maximum number of records to return per ticker
+        
+    Returns:
+        A dict mapping each ticker to its metrics (as get_financial_metrics_db would
+        return them), or None if the query fails
+    """
+    try:
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            # Rank rows within each ticker so the limit applies per ticker
+            cursor.execute(
+                f"""
+                SELECT {FINANCIAL_METRICS_COLS} FROM (
+                    SELECT {FINANCIAL_METRICS_COLS}, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY report_period DESC) AS row_num
+                    FROM financial_metrics 
+                    WHERE ticker = ANY(%s) 
+                      AND report_period <= %s 
+                      AND period = %s 
+                ) ranked
+                WHERE row_num <= %s
+                ORDER BY ticker, report_period DESC
+                """, 
+                (list(tickers), end_date, period, limit)
+            )
+            results = cursor.fetchall()
+        
+        return _group_by_ticker(results, tickers, _financial_metrics_from_rows)
         
     except Exception as e:
         print(f"Error fetching financial metrics from database: {e}")
@@ -320,47 +585,21 @@ def save_financial_metrics(metrics: list[FinancialMetrics]) -> bool:
         return False
         
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Every FinancialMetrics row has the same columns
+        fields = tuple(FinancialMetrics.model_fields)
+        sql = _upsert_sql('financial_metrics', fields, ('ticker', 'report_period', 'period'))
         
-        # Insert records
-        insert_count = 0
+        # One row per (ticker, report_period, period); a later metric replaces an earlier one
+        rows = {}
         for metric in metrics:
-            try:
-                data = metric.model_dump()
-                
-                # Build field lists
-                fields = list(data.keys())
-                
-                # Generate placeholders
-                placeholders = ', '.join(['%s'] * len(fields))
-                fields_str = ', '.join(fields)
-                update_fields = ', '.join([f"{field} = EXCLUDED.{field}" for field in fields])
-                update_fields += ", updated_at = CURRENT_TIMESTAMP"
-                
-                # Build SQL query
-                sql = f"""
-                INSERT INTO financial_metrics ({fields_str})
-                VALUES ({placeholders})
-                ON CONFLICT (ticker, report_period, period) DO UPDATE SET {update_fields}
-                """
-                
-                # Execute query
-                cursor.execute(sql, [data[field] for field in fields])
-                insert_count += 1
-                
-            except Exception as inner_e:
-                print(f"Error inserting financial metrics for {metric.ticker} on {metric.report_period}: {inner_e}")
-        
-        # Commit the transaction
-        conn.commit()
+            data = metric.model_dump()
+            rows[(data['ticker'], data['report_period'], data['period'])] = tuple(data[field] for field in fields)
         
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(async_commit=True) as cursor:
+            # Insert the batch as multi-row VALUES statements
+            execute_values(cursor, sql, list(rows.values()), page_size=1000)
         
-        print(f"Successfully saved {insert_count} financial metrics records")
+        print(f"Successfully saved {len(rows)} financial metrics records")
         return True
         
     except Exception as e:
@@ -388,34 +627,27 @@ def get_line_items_db(
         A list of LineItem objects or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # With the new schema, we need to select specific columns from the line_items table
-        # Convert the line_items list to a comma-separated string of column names
-        line_items_columns = ', '.join(line_items)
-        
-        # Build the SQL query to select all requested columns
-        sql = f"""
-        SELECT 
-            ticker, report_period, period, currency, 
-            {line_items_columns}
-        FROM line_items 
-        WHERE ticker = %s 
-          AND report_period <= %s 
-          AND period = %s
-        ORDER BY report_period DESC
-        LIMIT %s
-        """
-        
-        # Execute the query
-        cursor.execute(sql, (ticker, end_date, period, limit))
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            # With the new schema, we need to select specific columns from the line_items table
+            # Convert the line_items list to a comma-separated string of column names
+            line_items_columns = ', '.join(line_items)
+            
+            # Build the SQL query to select all requested columns
+            sql = f"""
+            SELECT 
+                ticker, report_period, period, currency, 
+                {line_items_columns}
+            FROM line_items 
+            WHERE ticker = %s 
+              AND report_period <= %s 
+              AND period = %s
+            ORDER BY report_period DESC
+            LIMIT %s
+            """
+            
+            # Execute the query
+            cursor.execute(sql, (ticker, end_date, period, limit))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
@@ -423,13 +655,11 @@ def get_line_items_db(
         
         # Convert the results directly to LineItem objects
         # Each row already has the structure we need
-        line_items_objects = []
         for result in results:
             # Convert date to string format
             result['report_period'] = result['report_period'].isoformat()
-            
-            # Create a LineItem object
-            line_items_objects.append(LineItem(**result))
+        
+        line_items_objects = [_db_model(LineItem, result) for result in results]
         
         # Sort by report_period in descending order (should already be sorted by the query)
         line_items_objects.sort(key=lambda x: x.report_period, reverse=True)
@@ -440,6 +670,21 @@ def get_line_items_db(
         print(f"Error fetching line items from database: {e}")
         return None
 
+# Key and descriptive columns every line item carries, then the optional metric columns
+# of the line_items table
+LINE_ITEM_BASE_FIELDS = ('ticker', 'report_period', 'period', 'currency')
+LINE_ITEM_METRIC_FIELDS = (
+    'cash_and_equivalents', 'current_assets', 'current_liabilities',
+    'outstanding_shares', 'total_assets', 'shareholders_equity', 'total_liabilities',
+    'goodwill_and_intangible_assets', 'total_debt', 'free_cash_flow', 'net_income',
+    'dividends_and_other_cash_distributions', 'depreciation_and_amortization',
+    'capital_expenditure', 'earnings_per_share', 'research_and_development',
+    'operating_income', 'revenue', 'working_capital', 'operating_margin',
+    'book_value_per_share', 'gross_margin', 'return_on_invested_capital', 'ebitda',
+    'ebit',
+)
+LINE_ITEM_METRIC_SET = frozenset(LINE_ITEM_METRIC_FIELDS)
+
 def save_line_items(ticker: str, line_items: list[LineItem]) -> bool:
     """
     Save line items to the PostgreSQL database.
@@ -455,66 +700,24 @@ def save_line_items(ticker: str, line_items: list[LineItem]) -> bool:
         return False
         
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert records
-        insert_count = 0
+        # Line items carry a varying set of metric fields. Group rows by column set so each
+        # shape is upserted with one statement; columns an item does not carry are left
+        # untouched on conflict. Within a shape, a later item for the same
+        # (ticker, report_period, period) replaces an earlier one.
+        batches = {}
         for item in line_items:
-            try:
-                # Convert object to dictionary
-                data = item.model_dump()
-                
-                # Extract standard fields that are part of the table schema
-                ticker_value = data.get('ticker', ticker)  # Use provided ticker if not in item
-                report_period = data.get('report_period')
-                period = data.get('period')
-                currency = data.get('currency')
-                
-                # Start building the SQL query - add all known financial metrics
-                fields = ['ticker', 'report_period', 'period', 'currency']
-                values = [ticker_value, report_period, period, currency]
-                
-                # Add financial metrics that exist in the data
-                for field_name, field_value in data.items():
-                    if field_name in ['ticker', 'report_period', 'period', 'currency']:
-                        continue  # Skip standard fields already added
-                    
-                    fields.append(field_name)
-                    values.append(field_value)
-                
-                # Build the SQL query with fields that exist
-                placeholders = ', '.join(['%s'] * len(fields))
-                fields_str = ', '.join(fields)
-                
-                # Create update clause for the fields
-                update_clauses = []
-                for field in fields:
-                    if field not in ['ticker', 'report_period', 'period']:  # Skip key fields
-                        update_clauses.append(f"{field} = EXCLUDED.{field}")
-                update_str = ', '.join(update_clauses)
-                update_str += ", updated_at = CURRENT_TIMESTAMP"
-                
-                sql = f"""
-                INSERT INTO line_items ({fields_str})
-                VALUES ({placeholders})
-                ON CONFLICT (ticker, report_period, period) DO UPDATE SET
-                    {update_str}
-                """
-                
-                cursor.execute(sql, values)
-                insert_count += 1
-                    
-            except Exception as inner_e:
-                print(f"Error inserting line items for {ticker} on {item.report_period}: {inner_e}")
-        
-        # Commit the transaction
-        conn.commit()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+            # Metrics are extra fields on the model; keep the ones the table has a column for
+            extra = item.model_extra or {}
+            metric_fields = tuple(field for field in extra if field in LINE_ITEM_METRIC_SET)
+            values = (item.ticker, item.report_period, item.period, item.currency) + tuple(extra[field] for field in metric_fields)
+            batches.setdefault(LINE_ITEM_BASE_FIELDS + metric_fields, {})[(item.ticker, item.report_period, item.period)] = values
+        
+        with db_cursor(async_commit=True) as cursor:
+            insert_count = 0
+            for fields, rows in batches.items():
+                sql = _upsert_sql('line_items', fields, ('ticker', 'report_period', 'period'))
+                execute_values(cursor, sql, list(rows.values()), page_size=1000)
+                insert_count += len(rows)
         
         print(f"Successfully saved {insert_count} line items records")
         return True
@@ -542,48 +745,91 @@ def get_insider_trades_db(
         A list of InsiderTrade objects or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Build the SQL query
-        sql = """
-        SELECT * FROM insider_trades
-        WHERE ticker = %s AND filing_date <= %s
-        """
-        params = [ticker, end_date]
-        
-        if start_date:
-            sql += " AND filing_date >= %s"
-            params.append(start_date)
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            # Build the SQL query
+            sql = f"""
+            SELECT {INSIDER_TRADE_COLS} FROM insider_trades
+            WHERE ticker = %s AND filing_date <= %s
+            """
+            params = [ticker, end_date]
             
-        sql += " ORDER BY filing_date DESC LIMIT %s"
-        params.append(limit)
-        
-        # Query the database
-        cursor.execute(sql, params)
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+            if start_date:
+                sql += " AND filing_date >= %s"
+                params.append(start_date)
+                
+            sql += " ORDER BY filing_date DESC LIMIT %s"
+            params.append(limit)
+            
+            # Query the database
+            cursor.execute(sql, params)
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
             return None
         
         # Convert to InsiderTrade objects
-        trades = []
-        for result in results:
-            # Convert dates to string format
-            if result.get('transaction_date'):
-                result['transaction_date'] = result['transaction_date'].isoformat()
-            result['filing_date'] = result['filing_date'].isoformat()
-            
-            # Create an InsiderTrade object
-            trades.append(InsiderTrade(**result))
+        return _insider_trades_from_rows(results)
         
-        return trades
+    except Exception as e:
+        print(f"Error fetching insider trades from database: {e}")
+        return None
+
+def _insider_trades_from_rows(results: list[dict]) -> list[InsiderTrade]:
+    """Format dates and convert insider trade rows to InsiderTrade objects."""
+    for result in results:
+        # Convert dates to string format
+        if result.get('transaction_date'):
+            result['transaction_date'] = result['transaction_date'].isoformat()
+        result['filing_date'] = result['filing_date'].isoformat()
+    
+    return [_db_model(InsiderTrade, result) for result in results]
+
+def get_insider_trades_bulk_db(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> dict[str, list[InsiderTrade] | None]:
+    """
+    Fetch insider trades for several tickers with a single query.
+    
+    Args:
+        tickers: The stock ticker symbols
+        end_date: The end date for filtering trades
+        start_date: Optional start date for filtering trades
+        limit: Maximum number of records to return per ticker
+        
+    Returns:
+        A dict mapping each ticker to its trades (as get_insider_trades_db would
+        return them), or None if the query fails
+    """
+    try:
+        # Build the SQL query
+        where = "ticker = ANY(%s) AND filing_date <= %s"
+        params = [list(tickers), end_date]
+        
+        if start_date:
+            where += " AND filing_date >= %s"
+            params.append(start_date)
+        
+        # Rank rows within each ticker so the limit applies per ticker
+        sql = f"""
+        SELECT {INSIDER_TRADE_COLS} FROM (
+            SELECT {INSIDER_TRADE_COLS}, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY filing_date DESC) AS row_num
+            FROM insider_trades
+            WHERE {where}
+        ) ranked
+        WHERE row_num <= %s
+        ORDER BY ticker, filing_date DESC
+        """
+        params.append(limit)
+        
+        with db_cursor(dict_cursor=True, numeric_as_float=True) as cursor:
+            cursor.execute(sql, params)
+            results = cursor.fetchall()
+        
+        return _group_by_ticker(results, tickers, _insider_trades_from_rows)
         
     except Exception as e:
         print(f"Error fetching insider trades from database: {e}")
@@ -647,34 +893,27 @@ def save_insider_trades(trades: list[InsiderTrade]) -> bool:
         df_grouped['created_at'] = current_time
         df_grouped['updated_at'] = current_time
         
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # For each ticker, delete existing records for that ticker
-        # This is a safer and more reliable approach than trying to match on all fields
-        tickers = df_grouped['ticker'].unique()
-        
-        for ticker in tickers:
-            cursor.execute("DELETE FROM insider_trades WHERE ticker = %s", (ticker,))
-            print(f"Deleted existing insider trades for {ticker}")
-        
-        # Now insert all the new records
+        # Write the grouped rows as CSV in memory for COPY, with \N marking NULLs
         columns = list(df_grouped.columns)
-        
-        # Convert DataFrame to list of tuples for insertion
-        values = [tuple(x) for x in df_grouped.values]
-        
-        # Insert all records at once using execute_values
-        insert_sql = f"INSERT INTO insider_trades ({', '.join(columns)}) VALUES %s"
-        execute_values(cursor, insert_sql, values)
-        
-        # Commit the transaction
-        conn.commit()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        buffer = io.StringIO()
+        df_grouped.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+        
+        # Delete and reload in one transaction so readers never see a ticker half-loaded
+        with db_cursor(async_commit=True) as cursor:
+            # Delete existing records for every ticker in the batch
+            # This is a safer and more reliable approach than trying to match on all fields
+            tickers = df_grouped['ticker'].unique().tolist()
+            
+            cursor.execute("DELETE FROM insider_trades WHERE ticker = ANY(%s)", (tickers,))
+            for ticker in tickers:
+                print(f"Deleted existing insider trades for {ticker}")
+            
+            # Now load all the new records at once with COPY
+            cursor.copy_expert(
+                f"COPY insider_trades ({', '.join(columns)}) FROM STDIN WITH CSV NULL '\\N'",
+                buffer
+            )
         
         # Print summary
         print(f"Saved {len(df_grouped)} insider trade records after deduplication")
@@ -703,46 +942,89 @@ def get_company_news_db(
         A list of CompanyNews objects or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Build the SQL query
-        sql = """
-        SELECT * FROM company_news
-        WHERE ticker = %s AND date <= %s
-        """
-        params = [ticker, end_date]
-        
-        if start_date:
-            sql += " AND date >= %s"
-            params.append(start_date)
+        with db_cursor(dict_cursor=True) as cursor:
+            # Build the SQL query
+            sql = f"""
+            SELECT {COMPANY_NEWS_COLS} FROM company_news
+            WHERE ticker = %s AND date <= %s
+            """
+            params = [ticker, end_date]
             
-        sql += " ORDER BY date DESC LIMIT %s"
-        params.append(limit)
-        
-        # Query the database
-        cursor.execute(sql, params)
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+            if start_date:
+                sql += " AND date >= %s"
+                params.append(start_date)
+                
+            sql += " ORDER BY date DESC LIMIT %s"
+            params.append(limit)
+            
+            # Query the database
+            cursor.execute(sql, params)
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
             return None
         
         # Convert to CompanyNews objects
-        news_list = []
-        for result in results:
-            # Convert date to string format
-            result['date'] = result['date'].isoformat()
-            
-            # Create a CompanyNews object
-            news_list.append(CompanyNews(**result))
+        return _company_news_from_rows(results)
+        
+    except Exception as e:
+        print(f"Error fetching company news from database: {e}")
+        return None
+
+def _company_news_from_rows(results: list[dict]) -> list[CompanyNews]:
+    """Format dates and convert company news rows to CompanyNews objects."""
+    for result in results:
+        # Convert date to string format
+        result['date'] = result['date'].isoformat()
+    
+    return [_db_model(CompanyNews, result) for result in results]
+
+def get_company_news_bulk_db(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> dict[str, list[CompanyNews] | None]:
+    """
+    Fetch company news for several tickers with a single query.
+    
+    Args:
+        tickers: The stock ticker symbols
+        end_date: The end date for filtering news
+        start_date: Optional start date for filtering news
+        limit: Maximum number of records to return per ticker
+        
+    Returns:
+        A dict mapping each ticker to its news (as get_company_news_db would return
+        them), or None if the query fails
+    """
+    try:
+        # Build the SQL query
+        where = "ticker = ANY(%s) AND date <= %s"
+        params = [list(tickers), end_date]
+        
+        if start_date:
+            where += " AND date >= %s"
+            params.append(start_date)
+        
+        # Rank rows within each ticker so the limit applies per ticker
+        sql = f"""
+        SELECT {COMPANY_NEWS_COLS} FROM (
+            SELECT {COMPANY_NEWS_COLS}, ROW_NUMBER() OVER (PARTITION BY ticker ORDER BY date DESC) AS row_num
+            FROM company_news
+            WHERE {where}
+        ) ranked
+        WHERE row_num <= %s
+        ORDER BY ticker, date DESC
+        """
+        params.append(limit)
         
-        return news_list
+        with db_cursor(dict_cursor=True) as cursor:
+            cursor.execute(sql, params)
+            results = cursor.fetchall()
+        
+        return _group_by_ticker(results, tickers, _company_news_from_rows)
         
     except Exception as e:
         print(f"Error fetching company news from database: {e}")
@@ -764,41 +1046,34 @@ def get_valuation_db(
         including weighted combined result, or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # First get the latest valuation date
-        cursor.execute(
-            """
-            SELECT MAX(biz_date) as latest_date 
-            FROM valuation
-            WHERE ticker = %s AND biz_date <= %s
-            """,
-            (ticker, end_date))
-        latest_date = cursor.fetchone()['latest_date']
-        
-        if not latest_date:
-            return None
+        with db_cursor(dict_cursor=True) as cursor:
+            # First get the latest valuation date
+            cursor.execute(
+                """
+                SELECT MAX(biz_date) as latest_date 
+                FROM valuation
+                WHERE ticker = %s AND biz_date <= %s
+                """,
+                (ticker, end_date))
+            latest_date = cursor.fetchone()['latest_date']
             
-        # Get all valuation methods for latest date including weighted result
-        cursor.execute(
-            """
-            SELECT * FROM valuation
-            WHERE ticker = %s AND biz_date = %s
-            ORDER BY 
-                CASE valuation_method 
-                    WHEN 'weighted' THEN 999
-                    ELSE 0
-                END,
-                valuation_method
-            """,
-            (ticker, latest_date))
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+            if not latest_date:
+                return None
+                
+            # Get all valuation methods for latest date including weighted result
+            cursor.execute(
+                """
+                SELECT * FROM valuation
+                WHERE ticker = %s AND biz_date = %s
+                ORDER BY 
+                    CASE valuation_method 
+                        WHEN 'weighted' THEN 999
+                        ELSE 0
+                    END,
+                    valuation_method
+                """,
+                (ticker, latest_date))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
@@ -827,24 +1102,17 @@ def get_technicals_db(
         A list of technical analysis records or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Query the database
-        cursor.execute(
-            """
-            SELECT * FROM technicals
-            WHERE ticker = %s AND biz_date <= %s
-            ORDER BY biz_date DESC, created_at DESC
-            LIMIT %s
-            """,
-            (ticker, end_date, limit))
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(dict_cursor=True) as cursor:
+            # Query the database
+            cursor.execute(
+                """
+                SELECT * FROM technicals
+                WHERE ticker = %s AND biz_date <= %s
+                ORDER BY biz_date DESC, created_at DESC
+                LIMIT %s
+                """,
+                (ticker, end_date, limit))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
@@ -873,24 +1141,17 @@ def get_sentiment_db(
         A list of sentiment analysis records or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Query the database
-        cursor.execute(
-            """
-            SELECT * FROM sentiment
-            WHERE ticker = %s AND biz_date <= %s
-            ORDER BY biz_date DESC, created_at DESC
-            LIMIT %s
-            """,
-            (ticker, end_date, limit))
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(dict_cursor=True) as cursor:
+            # Query the database
+            cursor.execute(
+                """
+                SELECT * FROM sentiment
+                WHERE ticker = %s AND biz_date <= %s
+                ORDER BY biz_date DESC, created_at DESC
+                LIMIT %s
+                """,
+                (ticker, end_date, limit))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
@@ -919,24 +1180,17 @@ def get_fundamentals_db(
         A list of fundamental analysis records or None if not found
     """
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Query the database
-        cursor.execute(
-            """
-            SELECT * FROM fundamentals
-            WHERE ticker = %s AND biz_date <= %s
-            ORDER BY biz_date DESC, created_at DESC
-            LIMIT %s
-            """,
-            (ticker, end_date, limit))
-        results = cursor.fetchall()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        with db_cursor(dict_cursor=True) as cursor:
+            # Query the database
+            cursor.execute(
+                """
+                SELECT * FROM fundamentals
+                WHERE ticker = %s AND biz_date <= %s
+                ORDER BY biz_date DESC, created_at DESC
+                LIMIT %s
+                """,
+                (ticker, end_date, limit))
+            results = cursor.fetchall()
         
         # Return None if no data found
         if not results:
@@ -964,49 +1218,43 @@ def save_sophie_analysis(
 ) -> bool:
     """Save Sophie agent analysis to database"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        sql = """
-        INSERT INTO sophie_analysis (
-            ticker, biz_date, signal, confidence, overall_score, reasoning,
-            short_term_outlook, medium_term_outlook, long_term_outlook,
-            bullish_factors, bearish_factors, risks,
-            model_name, model_display_name
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s,
-            %s::jsonb, %s::jsonb, %s::jsonb,
-            %s, %s
-        )
-        ON CONFLICT (ticker, biz_date, model_display_name) DO UPDATE SET
-            signal = EXCLUDED.signal,
-            confidence = EXCLUDED.confidence,
-            overall_score = EXCLUDED.overall_score,
-            reasoning = EXCLUDED.reasoning,
-            short_term_outlook = EXCLUDED.short_term_outlook,
-            medium_term_outlook = EXCLUDED.medium_term_outlook,
-            long_term_outlook = EXCLUDED.long_term_outlook,
-            bullish_factors = EXCLUDED.bullish_factors,
-            bearish_factors = EXCLUDED.bearish_factors,
-            risks = EXCLUDED.risks,
-            model_name = EXCLUDED.model_name,
-            model_display_name = EXCLUDED.model_display_name,
-            updated_at = CURRENT_TIMESTAMP
-        """
-        
-        cursor.execute(sql, (
-            ticker, biz_date, signal, confidence, overall_score, reasoning,
-            time_horizon_analysis.get('short_term', ''),
-            time_horizon_analysis.get('medium_term', ''),
-            time_horizon_analysis.get('long_term', ''),
-            json.dumps(bullish_factors), json.dumps(bearish_factors), json.dumps(risks),
-            model_name, model_display_name
-        ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with db_cursor() as cursor:
+            sql = """
+            INSERT INTO sophie_analysis (
+                ticker, biz_date, signal, confidence, overall_score, reasoning,
+                short_term_outlook, medium_term_outlook, long_term_outlook,
+                bullish_factors, bearish_factors, risks,
+                model_name, model_display_name
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s,
+                %s::jsonb, %s::jsonb, %s::jsonb,
+                %s, %s
+            )
+            ON CONFLICT (ticker, biz_date, model_display_name) DO UPDATE SET
+                signal = EXCLUDED.signal,
+                confidence = EXCLUDED.confidence,
+                overall_score = EXCLUDED.overall_score,
+                reasoning = EXCLUDED.reasoning,
+                short_term_outlook = EXCLUDED.short_term_outlook,
+                medium_term_outlook = EXCLUDED.medium_term_outlook,
+                long_term_outlook = EXCLUDED.long_term_outlook,
+                bullish_factors = EXCLUDED.bullish_factors,
+                bearish_factors = EXCLUDED.bearish_factors,
+                risks = EXCLUDED.risks,
+                model_name = EXCLUDED.model_name,
+                model_display_name = EXCLUDED.model_display_name,
+                updated_at = CURRENT_TIMESTAMP
+            """
+            
+            cursor.execute(sql, (
+                ticker, biz_date, signal, confidence, overall_score, reasoning,
+                time_horizon_analysis.get('short_term', ''),
+                time_horizon_analysis.get('medium_term', ''),
+                time_horizon_analysis.get('long_term', ''),
+                json.dumps(bullish_factors), json.dumps(bearish_factors), json.dumps(risks),
+                model_name, model_display_name
+            ))
         return True
         
     except Exception as e:
@@ -1027,45 +1275,23 @@ def save_company_news(news_list: list[CompanyNews]) -> bool:
         return False
         
     try:
-        # Connect to PostgreSQL
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Insert records
-        insert_count = 0
-        for news in news_list:
-            try:
-                data = news.model_dump()
-                
-                # Build field lists
-                fields = list(data.keys())
-                
-                # Generate placeholders
-                placeholders = ', '.join(['%s'] * len(fields))
-                fields_str = ', '.join(fields)
-                update_fields = ', '.join([f"{field} = EXCLUDED.{field}" for field in fields])
-                update_fields += ", updated_at = CURRENT_TIMESTAMP"
-                
-                # Build SQL query
-                sql = f"""
-                INSERT INTO company_news ({fields_str})
-                VALUES ({placeholders})
-                ON CONFLICT (ticker, url) DO UPDATE SET {update_fields}
-                """
-                
-                # Execute query
-                cursor.execute(sql, [data[field] for field in fields])
-                insert_count += 1
-                
-            except Exception as inner_e:
-                print(f"Error inserting company news for {news.ticker} on {news.date}: {inner_e}")
-        
-        # Commit the transaction
-        conn.commit()
-        
-        # Close cursor and connection
-        cursor.close()
-        conn.close()
+        # Every CompanyNews row has the same columns
+        fields = tuple(CompanyNews.model_fields)
+        sql = _upsert_sql('company_news', fields, ('ticker', 'url'), single_row=True)
+        
+        with db_cursor(async_commit=True) as cursor:
+            # Insert records
+            insert_count = 0
+            for news in news_list:
+                try:
+                    data = news.model_dump()
+                    
+                    # Execute query
+                    cursor.execute(sql, [data[field] for field in fields])
+                    insert_count += 1
+                    
+                except Exception as inner_e:
+                    print(f"Error inserting company news for {news.ticker} on {news.date}: {inner_e}")
         
         print(f"Successfully saved {insert_count} company news records")
         return True
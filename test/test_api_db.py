@@ -0,0 +1,123 @@
+import unittest
+import datetime
+from unittest.mock import patch
+
+# Import test utilities to set up path
+import test_utils
+
+import src.tools.api_db as api_db
+
+
+class FakeCursor:
+    """Cursor over FakeConnection that mimics PostgreSQL's handling of PREPARE/EXECUTE."""
+
+    def __init__(self, conn):
+        self.connection = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        conn = self.connection
+        if sql.startswith("PREPARE "):
+            conn.server_pending.add(sql.split()[1])
+            return
+        if sql.startswith("EXECUTE "):
+            name = sql.split()[1]
+            if name not in conn.server_prepared | conn.server_pending:
+                raise RuntimeError(f'prepared statement "{name}" does not exist')
+            if conn.fail_next_execute:
+                conn.fail_next_execute = False
+                raise RuntimeError("canceling statement due to statement timeout")
+            self._rows = [dict(row) for row in conn.rows]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """Connection whose prepared statements are dropped on rollback, as in PostgreSQL."""
+
+    closed = 0
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.prepared = set()
+        self.pending_prepared = set()
+        self.server_prepared = set()
+        self.server_pending = set()
+        self.fail_next_execute = False
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.server_prepared |= self.server_pending
+        self.server_pending.clear()
+
+    def rollback(self):
+        self.server_pending.clear()
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        pass
+
+
+class TestPreparedStatements(unittest.TestCase):
+    """Tests for the server-side prepared statements used by the hot getters."""
+
+    def setUp(self):
+        self.conn = FakeConnection([{
+            'ticker': 'AAPL',
+            'time': datetime.datetime(2024, 1, 2),
+            'biz_date': datetime.date(2024, 1, 2),
+            'open': 185.0,
+            'close': 186.0,
+            'high': 187.0,
+            'low': 184.0,
+            'volume': 1000,
+        }])
+        patcher = patch.object(api_db, '_pool', FakePool(self.conn))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Type casters cannot be registered on the fake cursor
+        patcher = patch.object(api_db.psycopg2.extensions, 'register_type')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_prepare_rolled_back_is_prepared_again(self):
+        """A PREPARE lost to a rollback is reissued by the next call on that connection."""
+        self.conn.fail_next_execute = True
+        self.assertIsNone(api_db.get_prices_db('AAPL', '2024-01-01', '2024-01-31'))
+        self.assertEqual(self.conn.prepared, set())
+
+        prices = api_db.get_prices_db('AAPL', '2024-01-01', '2024-01-31')
+        self.assertIsNotNone(prices)
+        self.assertEqual(len(prices), 1)
+        self.assertEqual(prices[0].close, 186.0)
+        self.assertEqual(self.conn.prepared, {'get_prices'})
+
+    def test_committed_prepare_is_reused(self):
+        """After a commit the statement is executed without preparing it again."""
+        api_db.get_prices_db('AAPL', '2024-01-01', '2024-01-31')
+        with patch.object(FakeCursor, 'execute', autospec=True, side_effect=FakeCursor.execute) as execute:
+            prices = api_db.get_prices_db('AAPL', '2024-01-01', '2024-01-31')
+
+        self.assertEqual(len(prices), 1)
+        statements = [call.args[1] for call in execute.call_args_list]
+        self.assertFalse(any(sql.startswith("PREPARE ") for sql in statements))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import io
+import contextlib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+# Import test utilities to set up path
+import test_utils
+
+from src.strategy.ml import _EarlyStoppingXGBClassifier, analyze_shap_values, train_and_evaluate_model
+
+
+class TestEarlyStoppingXGBClassifier(unittest.TestCase):
+    """Tests for the XGBoost classifier that early-stops on its own recent tail."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(400, 3)), columns=['a', 'b', 'c'])
+        # Positives are clustered and all fall before the last 10% of the rows
+        self.y = pd.Series((self.X['a'] > 0.5) & (np.arange(400) < 300)).astype(int)
+
+    def _model(self):
+        return _EarlyStoppingXGBClassifier(
+            n_estimators=50,
+            early_stopping_rounds=5,
+            eval_metric='auc',
+            random_state=42,
+            n_jobs=1
+        )
+
+    def test_one_class_tail_fits_without_early_stopping(self):
+        """A single-class eval tail keeps every tree instead of stopping after the first."""
+        model = self._model().fit(self.X, self.y)
+
+        self.assertEqual(model.get_booster().num_boosted_rounds(), 50)
+        self.assertEqual(model.early_stopping_rounds, 5)
+        self.assertGreater(len(np.unique(model.predict(self.X))), 1)
+
+    def test_eval_fraction_not_passed_to_booster(self):
+        """eval_fraction stays a sklearn parameter and never reaches the booster."""
+        model = self._model()
+
+        self.assertIn('eval_fraction', model.get_params())
+        self.assertNotIn('eval_fraction', model.get_xgb_params())
+
+
+class TestTrainAndEvaluateModel(unittest.TestCase):
+    """Tests for train_and_evaluate_model."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame(rng.normal(size=(300, 4)), columns=['a', 'b', 'c', 'd'])
+        self.splits = (slice(0, 180), slice(180, 240), slice(240, 300))
+
+    def _evaluate(self, model, y, **kwargs):
+        train, val, test = self.splits
+        # Silence the metric and report printing
+        with contextlib.redirect_stdout(io.StringIO()):
+            return train_and_evaluate_model(
+                model,
+                self.X[train], y[train],
+                self.X[val], y[val],
+                self.X[test], y[test],
+                "RF",
+                plot=False,
+                **kwargs
+            )
+
+    def test_refit_drops_cached_shap_explainer(self):
+        """SHAP analysis after an in-place refit explains the new trees, not the old ones."""
+        model = RandomForestClassifier(n_estimators=20, random_state=42)
+        _, _, report = self._evaluate(model, (self.X['a'] > 0).astype(int))
+        self.assertEqual(report['shap_analysis']['feature_importance']['Feature'].iloc[0], 'a')
+
+        _, _, report = self._evaluate(model, (self.X['d'] > 0).astype(int))
+        self.assertEqual(report['shap_analysis']['feature_importance']['Feature'].iloc[0], 'd')
+
+    def test_already_fitted_skips_validation_metrics(self):
+        """A model refit on train+val reports no (in-sample) validation metrics."""
+        y = (self.X['a'] > 0).astype(int)
+        model = RandomForestClassifier(n_estimators=20, random_state=42).fit(self.X[:240], y[:240])
+        _, _, report = self._evaluate(model, y, already_fitted=True)
+
+        for key in ('val_accuracy', 'val_roc_auc', 'train_val_acc_diff', 'train_val_auc_diff'):
+            self.assertIsNone(report[key])
+        self.assertIsNotNone(report['test_roc_auc'])
+
+
+if __name__ == "__main__":
+    unittest.main()